@@ -0,0 +1,109 @@
+"""
+Shared pytest setup for the backend test scripts.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+
+import pytest
+from dotenv import load_dotenv
+
+# Put the backend directory on the path once, so every test imports the
+# package as `src.agent`, the same way the package imports itself
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if _BACKEND_DIR not in sys.path:
+    sys.path.insert(0, _BACKEND_DIR)
+
+# Load environment variables once for the whole session
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/Hackwave")
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:2024")
+
+# Tests drive MongoDB from one thread at a time, so size the shared pool for
+# that before the memory module reads its client options
+os.environ.setdefault("MONGODB_MAX_POOL_SIZE", "5")
+os.environ.setdefault("MONGODB_MIN_POOL_SIZE", "1")
+
+# Test data is deleted as soon as each test finishes, so acknowledge writes
+# from the primary alone instead of waiting on replication and the journal
+os.environ.setdefault("MONGODB_WRITE_CONCERN", "1")
+
+
+@pytest.fixture(scope="session")
+def mongo_client():
+    """
+    The one MongoClient shared by every test in the session.
+    
+    This is the same process-wide client the memory managers use for the
+    URL, so tests and managers draw from a single connection pool. The
+    memory module closes it at exit, after flushing buffered writes. Tests
+    that need it are skipped when MongoDB is not reachable.
+    """
+    from src.agent.memory import _get_mongo_client
+    
+    client = _get_mongo_client(MONGODB_URL)
+    try:
+        client.admin.command("ping")
+    except Exception as e:
+        pytest.skip(f"MongoDB is not reachable at {MONGODB_URL}: {e}")
+    return client
+
+
+@pytest.fixture(scope="session")
+def memory_manager(mongo_client):
+    """
+    A MongoDB memory manager on the shared client.
+    
+    The manager is the process-wide one for the URL, which the memory module
+    flushes and closes at exit, so it is not closed here.
+    """
+    from src.agent.memory import create_memory_manager
+    
+    return create_memory_manager(MONGODB_URL)
+
+
+@pytest.fixture
+async def client():
+    """
+    An httpx client on the running backend, for the endpoint tests.
+    
+    Tests that use it are skipped when nothing answers at API_BASE_URL. The
+    client has no overall timeout because the refine endpoints wait on the
+    LLM; quick probes pass their own.
+    """
+    import httpx
+    
+    async with httpx.AsyncClient(base_url=API_BASE_URL, timeout=None) as client:
+        try:
+            await client.get("/api/health", timeout=5)
+        except httpx.TransportError:
+            pytest.skip(f"Backend is not running at {API_BASE_URL}")
+        yield client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_graph():
+    """
+    Run one throwaway query so the first real test skips the cold start.
+    
+    Importing the graph and creating the first Gemini client dominate the
+    first invocation; the warm-up pays that once per worker. It calls
+    Gemini, so it only runs with WARM_GRAPH=1 and an API key, and a failure
+    is logged and left for the real tests to report.
+    """
+    if os.getenv("WARM_GRAPH") != "1" or not os.getenv("GEMINI_API_KEY"):
+        return
+    try:
+        from src.agent.graph import graph
+        
+        asyncio.run(graph.ainvoke(
+            {"user_query": "ping", "agent_history": [], "current_step": 1, "max_steps": 1, "is_complete": False},
+            {"configurable": {"thread_id": "_warmup"}}
+        ))
+    except Exception as e:
+        logger.warning(f"Graph warm-up failed: {e}")
@@ -0,0 +1,163 @@
+"""
+Opt-in result cache for graph runs made by the test scripts.
+
+With GRAPH_CACHE=1 set, and only while pytest is running a test
+(PYTEST_CURRENT_TEST is set), each graph result is stored in the
+`test_graph_cache` MongoDB collection, so reruns of the same hard-coded
+queries skip the LLM calls. The key is a sha256 of the input state, the
+config minus its thread_id (the tests generate fresh ones per run), and the
+source of src/agent, so any change to the agent code misses the cache and
+runs the graph again. Set CLEAR_GRAPH_CACHE=1 to drop the cache before the
+first lookup. Otherwise, or when MongoDB is unreachable, the graph is always
+invoked.
+
+A cache hit never runs the graph, so nothing is written to memory for the
+run's thread. Tests that check memory afterwards must call the graph directly.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+from src.agent.memory import _get_mongo_client
+from src.agent.state import AgentType, DebateCategory, QueryType, SupervisorDecision
+
+logger = logging.getLogger(__name__)
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/Hackwave")
+CACHE_COLLECTION = "test_graph_cache"
+AGENT_SOURCE_DIR = Path(__file__).resolve().parent / "src" / "agent"
+
+# State fields holding enums, restored from their stored values on a hit
+_ENUM_FIELDS = {
+    "query_type": QueryType,
+    "debate_category": DebateCategory,
+    "active_agent": AgentType,
+    "supervisor_decision": SupervisorDecision,
+}
+
+_collection = None
+_collection_lock = threading.Lock()
+
+
+def _cache_enabled() -> bool:
+    """The cache is only used when opted into, and only under pytest."""
+    return os.getenv("GRAPH_CACHE") == "1" and bool(os.getenv("PYTEST_CURRENT_TEST"))
+
+
+@functools.lru_cache(maxsize=None)
+def _agent_source_hash() -> str:
+    """Hash every module under src/agent, so code changes invalidate the cache."""
+    digest = hashlib.sha256()
+    for path in sorted(AGENT_SOURCE_DIR.rglob("*.py")):
+        digest.update(path.relative_to(AGENT_SOURCE_DIR).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _get_collection():
+    """
+    Return the cache collection on the shared MongoClient, connecting on first use.
+    
+    Returns None when MongoDB cannot be reached, which disables the cache for
+    the rest of the process.
+    """
+    global _collection
+    with _collection_lock:
+        if _collection is None:
+            try:
+                client = _get_mongo_client(MONGODB_URL)
+                client.admin.command("ping")
+                collection = client.get_default_database("Hackwave")[CACHE_COLLECTION]
+                if os.getenv("CLEAR_GRAPH_CACHE") == "1":
+                    collection.drop()
+                    logger.info("Cleared the graph result cache")
+                _collection = collection
+            except Exception as e:
+                logger.error(f"Graph result cache disabled: {e}")
+                _collection = False
+        return _collection or None
+
+
+def _cache_key(state: Dict[str, Any], config: Optional[Dict[str, Any]]) -> str:
+    """Hash the agent source, the input state and the config minus its thread_id."""
+    configurable = {
+        k: v for k, v in ((config or {}).get("configurable") or {}).items()
+        if k != "thread_id"
+    }
+    payload = json.dumps(
+        {"source": _agent_source_hash(), "state": _encode(state), "config": configurable},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _encode(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a graph state to JSON types, keeping messages restorable."""
+    document = dict(result)
+    if document.get("messages"):
+        document["messages"] = messages_to_dict(document["messages"])
+    return json.loads(json.dumps(document, default=lambda value: getattr(value, "value", str(value))))
+
+
+def _decode(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the enums and messages of a stored graph state."""
+    result = dict(document)
+    for field, enum in _ENUM_FIELDS.items():
+        if result.get(field) is not None:
+            result[field] = enum(result[field])
+    if result.get("messages"):
+        result["messages"] = messages_from_dict(result["messages"])
+    return result
+
+
+def _lookup(key: str) -> Optional[Dict[str, Any]]:
+    """Return the stored result for a key, or None on a miss."""
+    collection = _get_collection()
+    if collection is None:
+        return None
+    try:
+        hit = collection.find_one({"_id": key})
+        return _decode(hit["result"]) if hit else None
+    except Exception as e:
+        logger.error(f"Graph result cache lookup failed: {e}")
+        return None
+
+
+def _store(key: str, result: Dict[str, Any]) -> None:
+    """Store a graph result under a key."""
+    collection = _get_collection()
+    if collection is None:
+        return
+    try:
+        collection.replace_one({"_id": key}, {"_id": key, "result": _encode(result)}, upsert=True)
+    except Exception as e:
+        logger.error(f"Graph result cache store failed: {e}")
+
+
+async def cached_ainvoke(graph, state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run graph.ainvoke, or return the stored result for the same input.
+    
+    Args:
+        graph: The compiled graph to run on a miss
+        state: The graph input state
+        config: The run config
+    """
+    if not _cache_enabled():
+        return await graph.ainvoke(state, config)
+    key = _cache_key(state, config)
+    cached = await asyncio.to_thread(_lookup, key)
+    if cached is not None:
+        return cached
+    result = await graph.ainvoke(state, config)
+    await asyncio.to_thread(_store, key, result)
+    return result
@@ -0,0 +1,109 @@
+"""
+Helpers shared by the backend test scripts that run the graph.
+
+Holds the thread ID generator, the invariant graph input fields, the
+streaming runner that reports supervisor routing as it happens, and the
+logging setup the scripts use when run directly.
+"""
+
+import itertools
+import logging
+import os
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.agent.graph import graph
+from src.agent.state import OverallState, QueryType
+
+logger = logging.getLogger(__name__)
+
+
+# Thread IDs come from a counter plus one per-run token, so a test run never
+# reuses a thread left behind by an earlier run
+_RUN_ID = f"{os.getpid()}_{uuid.uuid4().hex[:8]}"
+_counter = itertools.count()
+
+
+def tid(prefix: str) -> str:
+    """Return a fresh thread ID for this run."""
+    return f"{prefix}_{_RUN_ID}_{next(_counter)}"
+
+
+# Invariant fields for a full graph input. Mutable values such as messages
+# and agent_history are set per state, so no list is shared between runs.
+BASE_STATE: OverallState = {
+    "query_type": QueryType.GENERAL,
+    "debate_category": None,
+    "domain_expert_analysis": None,
+    "ux_ui_specialist_analysis": None,
+    "technical_architect_analysis": None,
+    "revenue_model_analyst_analysis": None,
+    "moderator_aggregation": None,
+    "debate_resolution": None,
+    "final_answer": None,
+    "processing_time": 0.0,
+    # Supervisor-related fields
+    "active_agent": None,
+    "supervisor_decision": None,
+    "supervisor_reasoning": None,
+    "current_step": 1,
+    "max_steps": 10,
+    "is_complete": False
+}
+
+# Invariant fields for queries that leave classification to the graph and
+# rely on thread memory, not the input, for earlier context
+THREAD_BASE_STATE: OverallState = {
+    "query_type": None,
+    "debate_content": None,
+    "current_step": 1,
+    "max_steps": 10,
+    "active_agent": None,
+    "supervisor_decision": None,
+    "supervisor_reasoning": None,
+    "is_complete": False,
+    "processing_time": 0.0,
+    "final_answer": None
+}
+
+
+async def stream_graph(state: OverallState, config: Optional[Dict[str, Any]] = None,
+                       log: logging.Logger = logger) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Stream the graph and return its final state with the agents it routed to.
+    
+    Each supervisor decision is logged as it arrives, so a misroute shows up
+    before the rest of the pipeline finishes.
+    
+    Args:
+        state: The graph input state
+        config: The run config
+        log: Logger for the routing progress, usually the calling script's
+    """
+    observed_agents = []
+    final_state = {}
+    async for mode, chunk in graph.astream(state, config, stream_mode=["updates", "values"]):
+        if mode == "values":
+            final_state = chunk
+            continue
+        supervisor_update = chunk.get("supervisor") or {}
+        if supervisor_update.get("active_agent"):
+            agent = supervisor_update["active_agent"].value
+            observed_agents.append(agent)
+            log.info("  🧭 Supervisor routed to %s", agent)
+    return final_state, observed_agents
+
+
+def configure_script_logging(log: logging.Logger) -> None:
+    """
+    Show a script's own INFO progress and only warnings from everything else.
+    
+    src/agent/memory.py calls logging.basicConfig(level=INFO) on import, so
+    the root handler is replaced with force=True and the root level raised to
+    WARNING, which quiets the memory module and the libraries.
+    
+    Args:
+        log: The calling script's logger
+    """
+    logging.basicConfig(format="%(message)s", level=logging.WARNING, force=True)
+    log.setLevel(logging.INFO)
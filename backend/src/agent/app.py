@@ -13,7 +13,12 @@ from langchain_core.messages import HumanMessage
 
 from src.agent.graph import graph
 from src.agent.state import OverallState, QueryType, DebateCategory, AgentType, SupervisorDecision
-from src.agent.memory import create_langgraph_memory_manager
+from src.agent.memory import create_langgraph_memory_manager, _parse_history_cursor
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; NDJSON streams fall back to json
+    orjson = None
 
 
 # Define request/response models
@@ -358,9 +363,26 @@ async def get_agents_info():
     }
 
 
+def _validate_history_cursor(before: Optional[str]) -> None:
+    """Reject a malformed before cursor with a 400, so it is not read as an empty page."""
+    if before is None:
+        return
+    try:
+        _parse_history_cursor(before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/api/conversation-history/{thread_id}")
-async def get_conversation_history(thread_id: str, limit: int = 10):
-    """Get conversation history for a specific thread."""
+async def get_conversation_history(thread_id: str, limit: int = 10, before: Optional[str] = None):
+    """
+    Get conversation history for a specific thread.
+    
+    Returns at most limit entries, newest first, each with the cursor of its
+    position. When more may exist, next_cursor holds the value to pass as
+    before for the next page.
+    """
+    _validate_history_cursor(before)
     try:
         from src.agent.memory import create_memory_manager
         
@@ -368,7 +390,6 @@ async def get_conversation_history(thread_id: str, limit: int = 10):
         
         # Check if memory manager is properly initialized
         if not memory_manager.conversations:
-            memory_manager.close()
             return {
                 "history": [],
                 "memory_context": None,
@@ -376,15 +397,19 @@ async def get_conversation_history(thread_id: str, limit: int = 10):
                 "error": "Database connection issue"
             }
         
-        history = memory_manager.get_conversation_history(thread_id, limit=limit)
-        memory_context = memory_manager.get_memory_context(thread_id)
-        thread_summary = memory_manager.get_thread_summary(thread_id)
-        memory_manager.close()
+        history, memory_context, thread_summary = await asyncio.gather(
+            memory_manager.get_conversation_history_async(thread_id, limit=limit, include_snapshot=True, before=before),
+            memory_manager.get_memory_context_async(thread_id),
+            memory_manager.get_thread_summary_async(thread_id)
+        )
         
+        # The manager is shared per URL and its close() is a blocking flush,
+        # so async handlers leave it open; the async reads already flushed
         return {
             "history": history,
             "memory_context": memory_context,
-            "thread_summary": thread_summary
+            "thread_summary": thread_summary,
+            "next_cursor": history[-1].get("cursor") if history and len(history) == limit else None
         }
     except Exception as e:
         return {
@@ -396,8 +421,9 @@ async def get_conversation_history(thread_id: str, limit: int = 10):
 
 
 @app.get("/api/conversation-history/default")
-async def get_default_conversation_history(limit: int = 20):
+async def get_default_conversation_history(limit: int = 20, before: Optional[str] = None):
     """Get recent conversation history from any thread for display."""
+    _validate_history_cursor(before)
     try:
         from src.agent.memory import create_memory_manager
         
@@ -409,7 +435,7 @@ async def get_default_conversation_history(limit: int = 20):
             return []
         
         # Get recent conversations from all threads using the new method
-        recent_conversations = memory_manager.get_all_conversation_history(limit=limit)
+        recent_conversations = memory_manager.get_all_conversation_history(limit=limit, include_snapshot=True, before=before)
         
         memory_manager.close()
         
@@ -419,6 +445,26 @@ async def get_default_conversation_history(limit: int = 20):
         return []
 
 
+@app.get("/api/conversation-history/{thread_id}/stream")
+async def stream_conversation_history(thread_id: str, limit: int = 10):
+    """Stream conversation history for a specific thread as newline-delimited JSON."""
+    from src.agent.memory import create_memory_manager
+    
+    memory_manager = create_memory_manager()
+    
+    def generate_history():
+        try:
+            for entry in memory_manager.get_conversation_history_iter(thread_id, limit=limit, include_snapshot=True):
+                if orjson is not None:
+                    yield orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE)
+                else:
+                    yield json.dumps(entry, default=str) + "\n"
+        finally:
+            memory_manager.close()
+    
+    return StreamingResponse(generate_history(), media_type="application/x-ndjson")
+
+
 @app.get("/api/thread-context/{thread_id}")
 async def get_thread_context(thread_id: str):
     """Get comprehensive context for a specific thread including history, memory, and summary."""
@@ -427,26 +473,25 @@ async def get_thread_context(thread_id: str):
         
         memory_manager = create_memory_manager()
         
-        # Get all context data with error handling
-        try:
-            history = memory_manager.get_conversation_history(thread_id, limit=20)
-        except Exception as e:
-            print(f"Error getting conversation history: {e}")
+        # Get all context data concurrently with error handling
+        history, memory_context, thread_summary = await asyncio.gather(
+            memory_manager.get_conversation_history_async(thread_id, limit=20, include_snapshot=True),
+            memory_manager.get_memory_context_async(thread_id),
+            memory_manager.get_thread_summary_async(thread_id),
+            return_exceptions=True
+        )
+        
+        if isinstance(history, Exception):
+            print(f"Error getting conversation history: {history}")
             history = []
             
-        try:
-            memory_context = memory_manager.get_memory_context(thread_id)
-        except Exception as e:
-            print(f"Error getting memory context: {e}")
+        if isinstance(memory_context, Exception):
+            print(f"Error getting memory context: {memory_context}")
             memory_context = None
             
-        try:
-            thread_summary = memory_manager.get_thread_summary(thread_id)
-        except Exception as e:
-            print(f"Error getting thread summary: {e}")
-            thread_summary = {"thread_id": thread_id, "error": str(e)}
-        
-        memory_manager.close()
+        if isinstance(thread_summary, Exception):
+            print(f"Error getting thread summary: {thread_summary}")
+            thread_summary = {"thread_id": thread_id, "error": str(thread_summary)}
         
         # Check if we have any context
         has_context = len(history) > 0 or memory_context is not None
@@ -479,8 +524,7 @@ async def clear_conversation_history(thread_id: str):
         from src.agent.memory import create_memory_manager
         
         memory_manager = create_memory_manager()
-        success = memory_manager.clear_thread_memory(thread_id)
-        memory_manager.close()
+        success = await memory_manager.clear_thread_memory_async(thread_id)
         
         if success:
             return {"message": f"Conversation history cleared for thread {thread_id}"}
@@ -513,7 +557,7 @@ async def get_context_for_thread(thread_id: str):
             }
         
         # Get conversation history
-        history = memory_manager.get_conversation_history(thread_id, limit=50)
+        history = memory_manager.get_conversation_history(thread_id, limit=50, include_snapshot=True)
         
         # Get memory context
         memory_context = memory_manager.get_memory_context(thread_id)
@@ -590,7 +634,7 @@ async def check_context_availability(request: ProductRequirementsRequest):
         
         # Check if thread has any history
         history = memory_manager.get_conversation_history(request.thread_id, limit=1)
-        memory_context = memory_manager.get_memory_context(request.thread_id)
+        memory_context = memory_manager.get_memory_context(request.thread_id, fields=[])
         
         memory_manager.close()
         
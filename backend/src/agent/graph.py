@@ -3,7 +3,7 @@ import time
 import asyncio
 import re
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -71,6 +71,45 @@ def get_genai_client():
     return _genai_client
 
 
+# Follow-up questions that clearly belong to one specialist are routed by
+# pattern instead of asking the supervisor LLM
+_FOLLOWUP_ROUTES = (
+    (re.compile(r"\b(moneti[sz]e|monetization|pricing|revenue|subscriptions?)\b", re.I),
+     AgentType.REVENUE_MODEL_ANALYST, "revenue_model_analyst_analysis"),
+    (re.compile(r"\b(technology stack|tech stack|scalability|scalable|infrastructure)\b", re.I),
+     AgentType.TECHNICAL_ARCHITECT, "technical_architect_analysis"),
+)
+
+
+def route_followup(state: OverallState) -> Optional[Tuple[AgentType, SupervisorDecision, str]]:
+    """Route a follow-up question by pattern, without an LLM call.
+    
+    Only the first supervisor step of a follow-up run qualifies: history that
+    is already present while current_step is still 1 came from an earlier run.
+    Later steps of any run carry this run's own history, and a new query
+    still needs the full pipeline even when it mentions pricing or the stack.
+    
+    Args:
+        state: Current graph state
+        
+    Returns:
+        (next_agent, decision, reasoning) when the follow-up matches a specialist,
+        otherwise None so the supervisor LLM decides
+    """
+    if not state.get("agent_history") or state.get("current_step", 1) != 1:
+        return None
+    
+    user_query = state.get("user_query", "")
+    for pattern, agent, analysis_field in _FOLLOWUP_ROUTES:
+        if pattern.search(user_query):
+            if state.get(analysis_field):
+                return (agent, SupervisorDecision.END,
+                        f"Follow-up answered by {agent.value}; finalizing.")
+            return (agent, SupervisorDecision.CONTINUE,
+                    f"Follow-up matches {agent.value}; routing directly.")
+    return None
+
+
 # Supervisor Node - The main orchestrator
 async def supervisor_node(state: OverallState, config: RunnableConfig) -> OverallState:
     """Supervisor node that decides which agent should act next.
@@ -95,72 +134,79 @@ async def supervisor_node(state: OverallState, config: RunnableConfig) -> Overal
     memory_manager = create_memory_manager()
     langgraph_memory = create_langgraph_memory_manager()
     
-    # Retrieve conversation history and LangGraph memory context if thread_id is available
-    conversation_context = ""
-    langgraph_context = ""
-    if thread_id:
-        try:
-            # Get regular conversation history
-            history = memory_manager.get_conversation_history(thread_id, limit=5)
-            if history:
-                conversation_context = "\n\nPrevious Conversation Context:\n"
-                for entry in reversed(history):  # Show most recent first
-                    conversation_context += f"- Step {entry.get('current_step', 'N/A')}: "
-                    conversation_context += f"{entry.get('user_query', 'No query')} "
-                    conversation_context += f"(Agent: {entry.get('active_agent', 'N/A')})\n"
-                    if entry.get('final_answer'):
-                        conversation_context += f"  Response: {entry.get('final_answer', '')[:200]}...\n"
-            
-            # Get LangGraph memory context for follow-up questions
-            langgraph_entries = langgraph_memory.get_conversation_context(thread_id, limit=10)
-            if langgraph_entries:
-                langgraph_context = "\n\nLangGraph Memory Context (for follow-up questions):\n"
-                for entry in reversed(langgraph_entries[-5:]):  # Show last 5 entries
-                    langgraph_context += f"- User: {entry.get('user_query', 'No query')}\n"
-                    langgraph_context += f"  Response: {entry.get('response', '')[:150]}...\n"
-                    if entry.get('context'):
-                        context_summary = str(entry.get('context'))[:100]
-                        langgraph_context += f"  Context: {context_summary}...\n"
-        except Exception as e:
-            print(f"Warning: Could not retrieve memory context: {e}")
-    
-    # Initialize Gemini 2.0 Flash for supervisor analysis
-    llm = ChatGoogleGenerativeAI(
-        model=configurable.model,
-        temperature=0.3,
-        max_retries=2,
-        api_key=os.getenv("GEMINI_API_KEY"),
-    )
-    structured_llm = llm.with_structured_output(SupervisorAnalysis)
-    
-    # Format the prompt with current state, conversation history, and LangGraph memory context
-    current_date = get_current_date()
-    formatted_prompt = supervisor_instructions.format(
-        user_query=state["user_query"],
-        current_step=state.get("current_step", 1),
-        max_steps=state.get("max_steps", 10),
-        agent_history=state.get("agent_history", []),
-        domain_expert_analysis=state.get("domain_expert_analysis", "Not completed"),
-        ux_ui_specialist_analysis=state.get("ux_ui_specialist_analysis", "Not completed"),
-        technical_architect_analysis=state.get("technical_architect_analysis", "Not completed"),
-        revenue_model_analyst_analysis=state.get("revenue_model_analyst_analysis", "Not completed"),
-        moderator_aggregation=state.get("moderator_aggregation", "Not completed"),
-        debate_resolution=state.get("debate_resolution", "Not applicable"),
-        current_date=current_date,
-        conversation_context=conversation_context + langgraph_context,
-    )
-    
-    # Get supervisor decision using async execution
-    result = await structured_llm.ainvoke(formatted_prompt)
+    # Clear-cut follow-ups skip the memory reads and the LLM call entirely
+    routed = route_followup(state)
+    if routed is None:
+        # Retrieve conversation history and LangGraph memory context if thread_id is available
+        conversation_context = ""
+        langgraph_context = ""
+        if thread_id:
+            try:
+                # Get regular conversation history
+                history = await memory_manager.get_conversation_history_async(thread_id, limit=5)
+                if history:
+                    conversation_context = "\n\nPrevious Conversation Context:\n"
+                    for entry in reversed(history):  # Show most recent first
+                        conversation_context += f"- Step {entry.get('current_step', 'N/A')}: "
+                        conversation_context += f"{entry.get('user_query', 'No query')} "
+                        conversation_context += f"(Agent: {entry.get('active_agent', 'N/A')})\n"
+                        if entry.get('final_answer'):
+                            conversation_context += f"  Response: {entry.get('final_answer', '')[:200]}...\n"
+                
+                # Get LangGraph memory context for follow-up questions
+                langgraph_entries = await langgraph_memory.get_memory_context_async(thread_id, limit=10)
+                if langgraph_entries:
+                    langgraph_context = "\n\nLangGraph Memory Context (for follow-up questions):\n"
+                    for entry in reversed(langgraph_entries[-5:]):  # Show last 5 entries
+                        langgraph_context += f"- User: {entry.get('user_query', 'No query')}\n"
+                        langgraph_context += f"  Response: {entry.get('response', '')[:150]}...\n"
+                        if entry.get('context'):
+                            context_summary = str(entry.get('context'))[:100]
+                            langgraph_context += f"  Context: {context_summary}...\n"
+            except Exception as e:
+                print(f"Warning: Could not retrieve memory context: {e}")
+        
+        # Initialize Gemini 2.0 Flash for supervisor analysis
+        llm = ChatGoogleGenerativeAI(
+            model=configurable.model,
+            temperature=0.3,
+            max_retries=2,
+            api_key=os.getenv("GEMINI_API_KEY"),
+        )
+        structured_llm = llm.with_structured_output(SupervisorAnalysis)
+        
+        # Format the prompt with current state, conversation history, and LangGraph memory context
+        current_date = get_current_date()
+        formatted_prompt = supervisor_instructions.format(
+            user_query=state["user_query"],
+            current_step=state.get("current_step", 1),
+            max_steps=state.get("max_steps", 10),
+            agent_history=state.get("agent_history", []),
+            domain_expert_analysis=state.get("domain_expert_analysis", "Not completed"),
+            ux_ui_specialist_analysis=state.get("ux_ui_specialist_analysis", "Not completed"),
+            technical_architect_analysis=state.get("technical_architect_analysis", "Not completed"),
+            revenue_model_analyst_analysis=state.get("revenue_model_analyst_analysis", "Not completed"),
+            moderator_aggregation=state.get("moderator_aggregation", "Not completed"),
+            debate_resolution=state.get("debate_resolution", "Not applicable"),
+            current_date=current_date,
+            conversation_context=conversation_context + langgraph_context,
+        )
+        
+        # Get supervisor decision using async execution
+        result = await structured_llm.ainvoke(formatted_prompt)
+        next_agent, decision, reasoning = result.next_agent, result.decision, result.reasoning
+    else:
+        next_agent, decision, reasoning = routed
+    supervisor_latency_ms = (time.time() - start_time) * 1000
     
     # Update agent history
     agent_history = state.get("agent_history", [])
     agent_history.append({
         "step": state.get("current_step", 1),
         "agent": "supervisor",
-        "decision": result.decision.value,
-        "next_agent": result.next_agent.value,
-        "reasoning": result.reasoning,
+        "decision": decision.value,
+        "next_agent": next_agent.value,
+        "reasoning": reasoning,
         "timestamp": time.time(),
         "is_followup": len(agent_history) > 0  # Mark as follow-up if there's previous history
     })
@@ -170,9 +216,10 @@ async def supervisor_node(state: OverallState, config: RunnableConfig) -> Overal
         try:
             # Merge current state with updates
             current_state = {**state, **{
-                "active_agent": result.next_agent,
-                "supervisor_decision": result.decision,
-                "supervisor_reasoning": result.reasoning,
+                "active_agent": next_agent,
+                "supervisor_decision": decision,
+                "supervisor_reasoning": reasoning,
+                "supervisor_latency_ms": supervisor_latency_ms,
                 "agent_history": agent_history,
                 "current_step": state.get("current_step", 1) + 1,
                 "processing_time": time.time() - start_time
@@ -182,9 +229,10 @@ async def supervisor_node(state: OverallState, config: RunnableConfig) -> Overal
             print(f"Warning: Could not save conversation memory: {e}")
     
     return {
-        "active_agent": result.next_agent,
-        "supervisor_decision": result.decision,
-        "supervisor_reasoning": result.reasoning,
+        "active_agent": next_agent,
+        "supervisor_decision": decision,
+        "supervisor_reasoning": reasoning,
+        "supervisor_latency_ms": supervisor_latency_ms,
         "agent_history": agent_history,
         "current_step": state.get("current_step", 1) + 1,
         "processing_time": time.time() - start_time
@@ -264,7 +312,7 @@ async def domain_expert_analysis(state: OverallState, config: RunnableConfig) ->
     
     # Get LangGraph memory context for deduplication
     langgraph_memory = create_langgraph_memory_manager()
-    langgraph_context = langgraph_memory.get_conversation_context(thread_id) if thread_id else []
+    langgraph_context = await langgraph_memory.get_memory_context_async(thread_id, limit=10) if thread_id else []
     
     # Check for duplicate analysis in recent context
     if langgraph_context:
@@ -733,7 +781,7 @@ async def finalize_answer(state: OverallState, config: RunnableConfig) -> Overal
                 "is_followup": True,
                 "processing_time": time.time() - start_time
             }
-            langgraph_memory.add_to_memory_array(
+            await langgraph_memory.add_to_memory_array_async(
                 thread_id=thread_id,
                 user_query=state["user_query"],
                 response=final_content,
@@ -795,7 +843,7 @@ async def finalize_answer(state: OverallState, config: RunnableConfig) -> Overal
                 "technical_architect_analysis": state.get("technical_architect_analysis", ""),
                 "revenue_model_analyst_analysis": state.get("revenue_model_analyst_analysis", "")
             }
-            langgraph_memory.add_to_memory_array(
+            await langgraph_memory.add_to_memory_array_async(
                 thread_id=thread_id,
                 user_query=state["user_query"],
                 response=result.content,
@@ -1,10 +1,26 @@
 import os
+import re
+import asyncio
 import json
 import time
-from typing import Dict, Any, List, Optional, Union
-from datetime import datetime
+import uuid
+import hashlib
+import functools
+import itertools
+import threading
+import atexit
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timezone
 import logging
 
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:  # Motor is optional; async methods fall back to worker threads
+    AsyncIOMotorClient = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,12 +28,447 @@ logger = logging.getLogger(__name__)
 # In-memory storage as fallback
 _in_memory_conversations = {}
 _in_memory_context = {}
-_in_memory_langgraph_array = []
+_in_memory_entries: "OrderedDict[str, MemoryEntry]" = OrderedDict()  # entry_id -> entry, oldest first
+_thread_index: Dict[str, List[str]] = {}  # thread_id -> entry_ids, oldest first
+_IN_MEMORY_MAX_ENTRIES = 1000
+
+# Top-level conversation fields copied from the graph state, with the value
+# stored when the state lacks them
+_CONV_FIELDS = {
+    "user_query": "",
+    "current_step": 1,
+    "agent_history": [],
+    "active_agent": None,
+    "supervisor_decision": None,
+    "supervisor_reasoning": None,
+    "is_complete": False,
+    "processing_time": 0.0,
+    "final_answer": "",
+}
+
+# Agent outputs stored under state_snapshot
+_SNAPSHOT_FIELDS = (
+    "domain_expert_analysis",
+    "ux_ui_specialist_analysis",
+    "technical_architect_analysis",
+    "revenue_model_analyst_analysis",
+    "moderator_aggregation",
+    "debate_resolution",
+    "final_answer",
+)
+
+# Conversation fields returned by get_conversation_history; the bulky
+# agent_history and state_snapshot subtrees are only fetched with include_snapshot
+_CONVERSATION_HISTORY_PROJECTION = {
+    "_id": 1,
+    "thread_id": 1,
+    "user_query": 1,
+    "final_answer": 1,
+    "processing_time": 1,
+    "query_type": 1,
+    "timestamp": 1,
+    "is_complete": 1,
+    "current_step": 1,
+    "active_agent": 1,
+    "supervisor_decision": 1,
+    "supervisor_reasoning": 1,
+}
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)  # sort key for entries without a timestamp
+
+# Array documents untouched for this long are expired by MongoDB's TTL monitor
+_MEMORY_RETENTION_SECONDS = 60 * 60 * 24 * 30
+
+# MongoClient options shared by every manager: a pool sized for concurrent
+# FastAPI workers, short timeouts so the in-memory fallback kicks in quickly
+# and a saturated pool fails fast, and wire compression for the large state
+# snapshots. Single-threaded callers such as the test scripts can shrink the
+# pool through MONGODB_MAX_POOL_SIZE / MONGODB_MIN_POOL_SIZE.
+_MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+    "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "5")),
+    "maxIdleTimeMS": 30000,
+    "waitQueueTimeoutMS": 1000,
+    "connectTimeoutMS": 2000,
+    "compressors": "zstd,snappy,zlib",
+    "zlibCompressionLevel": 1,
+    # Return timezone-aware UTC datetimes, matching what is written
+    "tz_aware": True,
+    "retryWrites": True,
+    "socketTimeoutMS": 5000,
+    "serverSelectionTimeoutMS": 2000,
+}
+
+# Callers writing throwaway data, such as the test scripts, can skip the
+# replication and journal waits by setting MONGODB_WRITE_CONCERN (e.g. "1").
+# Unset, the server's default write concern applies.
+_write_concern = os.getenv("MONGODB_WRITE_CONCERN")
+if _write_concern:
+    _MONGO_CLIENT_OPTIONS["w"] = int(_write_concern) if _write_concern.isdigit() else _write_concern
+    _MONGO_CLIENT_OPTIONS["journal"] = False
+
+
+@dataclass(slots=True)
+class MemoryEntry:
+    """A single entry of the LangGraph memory array."""
+    thread_id: str
+    user_query: str
+    response: str
+    context: Dict[str, Any]
+    timestamp: datetime
+    entry_id: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the entry to a plain dict for MongoDB and API responses."""
+        return {
+            "thread_id": self.thread_id,
+            "user_query": self.user_query,
+            "response": self.response,
+            "context": self.context,
+            "timestamp": self.timestamp,
+            "entry_id": self.entry_id
+        }
+
+
+def _in_memory_thread_entries(thread_id: str, limit: int) -> List[Dict[str, Any]]:
+    """Get the most recent in-memory entries of a thread, oldest first."""
+    entry_ids = _thread_index.get(thread_id, [])
+    return [_in_memory_entries[entry_id].to_dict() for entry_id in entry_ids[-limit:]] if limit > 0 else []
+
+
+def _without_none(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop None-valued fields; readers already default missing fields."""
+    return {key: value for key, value in document.items() if value is not None}
+
+
+def _ensure_thread_timestamp_index(collection) -> None:
+    """
+    Create the (thread_id, timestamp DESC, _id DESC) compound index on a collection.
+    
+    The compound index serves both the thread_id match and the timestamp sort
+    of every per-thread read, with _id breaking timestamp ties for keyset
+    pagination, so the standalone thread_id and (thread_id, timestamp)
+    indexes are redundant.
+    """
+    collection.create_index([("thread_id", 1), ("timestamp", -1), ("_id", -1)])
+    indexes = collection.index_information()
+    for name in ("thread_id_1", "thread_id_1_timestamp_-1"):
+        if name in indexes:
+            collection.drop_index(name)
+
+
+def _ensure_named_index(collection, keys: List[tuple], name: str) -> None:
+    """
+    Create a named index, replacing an existing one with different keys.
+    
+    MongoDB refuses to create an index under a name that is already taken
+    by another key pattern, so the old definition is dropped first.
+    """
+    existing = collection.index_information().get(name)
+    if existing is not None and [tuple(key) for key in existing["key"]] != [tuple(key) for key in keys]:
+        collection.drop_index(name)
+    collection.create_index(keys, name=name)
+
+
+def _ensure_checkpoint_indexes(collection) -> None:
+    """
+    Expire checkpoints after the retention period.
+    
+    Checkpoints are identified by their ObjectId _id, so the index left
+    over from the old checkpoint_id string field is dropped.
+    """
+    if "checkpoint_id_1" in collection.index_information():
+        collection.drop_index("checkpoint_id_1")
+    collection.create_index("timestamp", expireAfterSeconds=_MEMORY_RETENTION_SECONDS)
+
+
+_indexed: set = set()  # (manager class, mongodb_url) whose indexes are in place
+_indexed_lock = threading.Lock()
+
+
+def _setup_indexes_once(manager) -> None:
+    """
+    Run a manager's index setup once per process for its class and URL.
+    
+    createIndexes is a no-op on the server for existing indexes, but each call
+    is still a round trip, so managers created later for the same URL skip it.
+    """
+    key = (type(manager).__name__, manager.mongodb_url)
+    with _indexed_lock:
+        if key not in _indexed:
+            manager._setup_indexes()
+            _indexed.add(key)
+
+
+_mongo_clients: Dict[str, Any] = {}  # mongodb_url -> MongoClient
+_mongo_clients_lock = threading.Lock()
+
+
+def _get_mongo_client(mongodb_url: str):
+    """
+    Return the process-wide MongoClient for a URL, creating it on first use.
+    
+    MongoClient is thread-safe and owns its connection pool, so every manager
+    shares one per URL instead of opening its own pool per request. Managers
+    therefore never close it; it is closed at interpreter exit.
+    """
+    with _mongo_clients_lock:
+        client = _mongo_clients.get(mongodb_url)
+        if client is None:
+            from pymongo import MongoClient
+            client = _mongo_clients[mongodb_url] = MongoClient(mongodb_url, **_MONGO_CLIENT_OPTIONS)
+        return client
+
+
+def _close_mongo_clients() -> None:
+    """Close every shared MongoClient."""
+    with _mongo_clients_lock:
+        for client in _mongo_clients.values():
+            client.close()
+        _mongo_clients.clear()
+
+
+# Registered before the write buffer so its exit flush runs first
+atexit.register(_close_mongo_clients)
+
+
+_motor_clients: Dict[tuple, Any] = {}  # (mongodb_url, event loop) -> AsyncIOMotorClient
+_motor_clients_lock = threading.Lock()
+
+
+def _get_motor_client(mongodb_url: str):
+    """
+    Return the shared Motor client for a URL on the running event loop.
+    
+    A Motor client is bound to the loop it first runs on, so clients are
+    shared per (URL, loop) rather than per URL. Clients of loops that have
+    since closed (e.g. after successive asyncio.run calls) are closed and
+    dropped here; the rest are closed at interpreter exit.
+    """
+    loop = asyncio.get_running_loop()
+    with _motor_clients_lock:
+        for key in [key for key in _motor_clients if key[1].is_closed()]:
+            _motor_clients.pop(key).close()
+        client = _motor_clients.get((mongodb_url, loop))
+        if client is None:
+            client = _motor_clients[(mongodb_url, loop)] = AsyncIOMotorClient(mongodb_url, **_MONGO_CLIENT_OPTIONS)
+        return client
+
+
+def _close_motor_clients() -> None:
+    """Close every shared Motor client."""
+    with _motor_clients_lock:
+        for client in _motor_clients.values():
+            client.close()
+        _motor_clients.clear()
+
+
+atexit.register(_close_motor_clients)
+
+
+class _WriteBuffer:
+    """
+    Buffers MongoDB writes and sends them in unordered bulk_write batches.
+    
+    A background thread flushes pending writes once max_batch of them are
+    queued or max_delay seconds after the first one arrives. Readers call
+    flush() first so a process always sees its own writes. Documents are
+    stamped with the server's clock on write, so timestamps are consistent
+    across workers regardless of clock skew.
+    """
+    
+    def __init__(self, max_batch: int = 32, max_delay: float = 0.05):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = []  # (collection, operation) pairs in insertion order
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._has_pending = threading.Event()
+        self._full = threading.Event()
+        self._thread = None
+    
+    def add(self, collection, document: Dict[str, Any]) -> None:
+        """
+        Queue a document for insertion into a collection.
+        
+        The insert is an upsert on a fresh _id (or the document's own) so that
+        $currentDate can set its timestamp field server-side.
+        """
+        self.add_many([(collection, document)])
+    
+    def add_many(self, writes: List[tuple]) -> None:
+        """
+        Queue several (collection, document) inserts at once.
+        
+        They are queued under one lock hold, so the same flush sends them all.
+        """
+        from bson import ObjectId
+        from pymongo import UpdateOne
+        operations = []
+        for collection, document in writes:
+            document = dict(document)
+            document_id = document.pop("_id", None) or ObjectId()
+            operations.append((collection, UpdateOne(
+                {"_id": document_id},
+                {"$set": document, "$currentDate": {"timestamp": True}},
+                upsert=True
+            )))
+        self._queue(operations)
+    
+    def _queue(self, operations: List[tuple]) -> None:
+        with self._lock:
+            self._pending.extend(operations)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mongodb-write-buffer", daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.max_batch:
+                self._full.set()
+        self._has_pending.set()
+    
+    def flush(self) -> None:
+        """Write all pending operations, one bulk_write per collection."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            
+            batches = {}
+            for collection, operation in pending:
+                batches.setdefault(id(collection), (collection, []))[1].append(operation)
+            
+            for collection, operations in batches.values():
+                try:
+                    collection.bulk_write(operations, ordered=False)
+                except Exception as e:
+                    logger.error(f"Failed to flush {len(operations)} buffered writes to {collection.name}: {e}")
+    
+    def _run(self):
+        """Flush batches in the background for the lifetime of the process."""
+        while True:
+            self._has_pending.wait()
+            self._full.wait(self.max_delay)
+            self._has_pending.clear()
+            self._full.clear()
+            self.flush()
+
+
+_write_buffer = _WriteBuffer()
+atexit.register(_write_buffer.flush)
+
+
+class _ReadCache:
+    """
+    Bounded LRU cache with a short TTL for per-thread MongoDB reads.
+    
+    The cache is per-process and shared by every manager instance, since
+    managers are created per request. It is not shared across workers, so
+    entries only live for a couple of seconds to bound staleness there.
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 2.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, kind: str, thread_id: str, default: Any = None) -> Any:
+        """Return a fresh cached value, or default on a miss."""
+        key = (kind, thread_id)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return default
+            if time.monotonic() - cached[0] > self.ttl:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return cached[1]
+    
+    def set(self, kind: str, thread_id: str, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[(kind, thread_id)] = (time.monotonic(), value)
+            self._entries.move_to_end((kind, thread_id))
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, thread_id: str, *kinds: str) -> None:
+        """Drop cached values for a thread (all kinds when none are given)."""
+        with self._lock:
+            for kind in kinds or ("memory_context", "thread_summary"):
+                self._entries.pop((kind, thread_id), None)
+
+
+_read_cache = _ReadCache()
+_CACHE_MISS = object()
+
+
+# Sort order of every conversation history read; _id breaks timestamp ties
+_HISTORY_SORT = [("timestamp", -1), ("_id", -1)]
+
+
+def _history_cursor(timestamp: Union[datetime, str], entry_id: Any) -> str:
+    """Encode the (timestamp, _id) position of a history entry as a page cursor."""
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    return f"{timestamp}|{entry_id}"
+
+
+def _parse_history_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """
+    Decode a page cursor into its timestamp and ObjectId.
+    
+    Raises:
+        ValueError: If the cursor is not one produced by _history_cursor
+    """
+    from bson import ObjectId
+    timestamp, _, entry_id = cursor.rpartition("|")
+    if not timestamp or not ObjectId.is_valid(entry_id):
+        raise ValueError(f"Invalid conversation history cursor: {cursor!r}")
+    return datetime.fromisoformat(timestamp), ObjectId(entry_id)
+
+
+def _with_cursor(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace each entry's _id with the cursor of its position."""
+    for entry in entries:
+        entry["cursor"] = _history_cursor(entry.get("timestamp") or _EPOCH, entry.pop("_id"))
+    return entries
+
+
+def _history_filter(thread_id: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the conversation history filter for one page.
+    
+    Pages are keyed on (timestamp, _id) rather than skipped over, so every
+    page is a bounded range scan of the (thread_id, timestamp, _id) or
+    recent_feed index however deep the caller has paged. Entries written in
+    the same flush share a timestamp, so _id decides their order and none
+    is skipped at a page boundary.
+    
+    Args:
+        thread_id: Thread identifier, or None for every thread
+        before: Cursor of the last entry of the previous page
+    """
+    query = {} if thread_id is None else {"thread_id": thread_id}
+    if before is not None:
+        timestamp, entry_id = _parse_history_cursor(before)
+        query["$or"] = [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "_id": {"$lt": entry_id}}
+        ]
+    return query
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_search_pattern(query: str) -> re.Pattern:
+    """Compile a case-insensitive literal pattern for a memory search query."""
+    return re.compile(re.escape(query), re.IGNORECASE)
+
 
 class LangGraphMemoryManager:
     """
-    LangGraph Memory Manager that stores one big array in MongoDB.
-    This array contains all conversation context and is used for follow-up questions.
+    LangGraph Memory Manager that stores the memory array in MongoDB.
+    The array is sharded into per-bucket documents keyed by a hash of the thread ID
+    and contains all conversation context used for follow-up questions.
     """
     
     def __init__(self, mongodb_url: str = "mongodb://localhost:27017/Hackwave"):
@@ -31,7 +482,9 @@ class LangGraphMemoryManager:
         self.client = None
         self.db = None
         self.langgraph_memory = None
-        self.array_id = "langgraph_memory_array"  # Single document ID for the array
+        self.async_langgraph_memory = None
+        self._async_loop = None
+        self.array_id = "langgraph_memory_array"  # Prefix for the sharded array document IDs
         
         # Try to connect to MongoDB, fallback to simple memory if fails
         try:
@@ -41,7 +494,7 @@ class LangGraphMemoryManager:
             from pymongo.database import Database
             
             self._connect()
-            self._setup_indexes()
+            _setup_indexes_once(self)
             logger.info("LangGraph Memory Manager initialized successfully")
         except Exception as e:
             logger.warning(f"MongoDB connection failed, using simple memory: {e}")
@@ -52,8 +505,7 @@ class LangGraphMemoryManager:
     def _connect(self):
         """Establish connection to MongoDB."""
         try:
-            from pymongo import MongoClient
-            self.client = MongoClient(self.mongodb_url)
+            self.client = _get_mongo_client(self.mongodb_url)
             self.db = self.client.get_database()
             self.langgraph_memory = self.db.langgraph_memory
             
@@ -67,13 +519,98 @@ class LangGraphMemoryManager:
     def _setup_indexes(self):
         """Setup database indexes for performance."""
         try:
-            # Index for the main array document
+            # Index for the array documents
             self.langgraph_memory.create_index("array_id")
-            self.langgraph_memory.create_index("timestamp")
+            # TTL index so stale buckets are pruned by the server
+            self.langgraph_memory.create_index("last_updated", expireAfterSeconds=_MEMORY_RETENTION_SECONDS)
             logger.info("LangGraph Memory indexes created successfully")
         except Exception as e:
             logger.error(f"Failed to setup indexes: {e}")
             raise
+        self._migrate_legacy_array()
+    
+    def _migrate_legacy_array(self):
+        """
+        Move entries from the unsharded array document into their buckets.
+        
+        Before the array was sharded every entry lived in one document whose
+        array_id is the bare prefix, which no bucket lookup matches. The
+        document is claimed with find_one_and_delete so only one process
+        migrates it, and its entries are prepended to their threads' buckets
+        since they predate anything written there. If a bucket write fails
+        the document is restored so the next startup retries.
+        """
+        legacy_doc = self.langgraph_memory.find_one_and_delete({"array_id": self.array_id})
+        if legacy_doc is None:
+            return
+        
+        buckets = {}
+        for entry in legacy_doc.get("memory_array", []):
+            buckets.setdefault(self._array_id_for(entry.get("thread_id", "")), []).append(entry)
+        
+        try:
+            for array_id, entries in buckets.items():
+                self.langgraph_memory.update_one(
+                    {"array_id": array_id},
+                    {
+                        "$push": {"memory_array": {"$each": entries, "$position": 0, "$slice": -1000}},
+                        "$currentDate": {"last_updated": True},
+                        "$setOnInsert": {"created_at": legacy_doc.get("created_at") or datetime.now(timezone.utc)}
+                    },
+                    upsert=True
+                )
+            logger.info(f"Migrated {sum(map(len, buckets.values()))} legacy LangGraph memory entries into {len(buckets)} buckets")
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy LangGraph memory array: {e}")
+            self.langgraph_memory.insert_one(legacy_doc)
+    
+    def _array_id_for(self, thread_id: str) -> str:
+        """
+        Get the array document ID for a thread.
+        
+        Threads are spread over hash buckets so concurrent writers land on
+        different documents and no single document approaches the 16 MB limit.
+        """
+        bucket = hashlib.blake2b(thread_id.encode(), digest_size=2).hexdigest()
+        return f"{self.array_id}_{bucket}"
+    
+    def _thread_tail_pipeline(self, thread_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation that returns only a thread's last entries.
+        
+        Buckets can be shared by several threads, so the array is filtered
+        to the thread before $slice; only the tail crosses the wire.
+        """
+        return [
+            {"$match": {"array_id": self._array_id_for(thread_id)}},
+            {"$project": {
+                "_id": 0,
+                "memory_array": {"$slice": [
+                    {"$filter": {"input": "$memory_array", "cond": {"$eq": ["$$this.thread_id", thread_id]}}},
+                    -limit
+                ]}
+            }}
+        ]
+    
+    def _thread_tail(self, thread_id: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Get a thread's last entries, or None when its bucket does not exist."""
+        for array_doc in self.langgraph_memory.aggregate(self._thread_tail_pipeline(thread_id, limit)):
+            return array_doc.get("memory_array") or []
+        return None
+    
+    def _all_array_docs(self, projection: Dict[str, Any] = None):
+        """Iterate over the array documents of every bucket."""
+        return self.langgraph_memory.find(
+            {"array_id": {"$regex": f"^{self.array_id}_"}},
+            projection
+        )
+    
+    def _all_entries(self) -> List[Dict[str, Any]]:
+        """Collect the entries of every bucket, oldest first."""
+        entries = [entry for array_doc in self._all_array_docs({"memory_array": 1})
+                   for entry in array_doc.get("memory_array", [])]
+        entries.sort(key=lambda entry: entry.get("timestamp") or _EPOCH)
+        return entries
     
     def add_to_memory_array(self, thread_id: str, user_query: str, response: str, 
                            context: Dict[str, Any] = None) -> bool:
@@ -89,76 +626,122 @@ class LangGraphMemoryManager:
         try:
             if self.langgraph_memory is None:
                 # Fallback to in-memory storage
-                global _in_memory_langgraph_array
-                entry = {
-                    "thread_id": thread_id,
-                    "user_query": user_query,
-                    "response": response,
-                    "context": context or {},
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "entry_id": f"{thread_id}_{int(time.time())}"
-                }
-                _in_memory_langgraph_array.append(entry)
+                entry = self._new_entry(thread_id, user_query, response, context)
+                _in_memory_entries[entry.entry_id] = entry
+                _thread_index.setdefault(thread_id, []).append(entry.entry_id)
+                
+                # Evict the oldest entries once the store is full
+                while len(_in_memory_entries) > _IN_MEMORY_MAX_ENTRIES:
+                    evicted_id, evicted = _in_memory_entries.popitem(last=False)
+                    thread_ids = _thread_index.get(evicted.thread_id)
+                    if thread_ids:
+                        thread_ids.remove(evicted_id)
+                        if not thread_ids:
+                            del _thread_index[evicted.thread_id]
                 logger.info(f"Added entry to in-memory LangGraph array for thread {thread_id}")
                 return True
             
             # Create the entry
-            entry = {
-                "thread_id": thread_id,
-                "user_query": user_query,
-                "response": response,
-                "context": context or {},
-                "timestamp": datetime.utcnow(),
-                "entry_id": f"{thread_id}_{int(time.time())}"
-            }
+            entry = self._new_entry(thread_id, user_query, response, context)
             
-            # Get or create the main array document
-            array_doc = self.langgraph_memory.find_one({"array_id": self.array_id})
+            # Read only the tail of this thread's bucket for duplicate detection
+            array_id = self._array_id_for(thread_id)
+            array_doc = self.langgraph_memory.find_one(
+                {"array_id": array_id},
+                {"memory_array": {"$slice": -10}}
+            ) or {}
             
-            if array_doc:
-                # Update existing array
-                memory_array = array_doc.get("memory_array", [])
-                
-                # Check for duplicates (same user_query and similar response)
-                is_duplicate = False
-                for existing_entry in memory_array[-10:]:  # Check last 10 entries
-                    if (existing_entry.get("user_query") == user_query and 
-                        self._is_similar_response(existing_entry.get("response", ""), response)):
-                        is_duplicate = True
-                        logger.info(f"Duplicate entry detected for thread {thread_id}, skipping")
-                        break
-                
-                if not is_duplicate:
-                    memory_array.append(entry)
-                    
-                    # Keep only last 1000 entries to prevent array from getting too large
-                    if len(memory_array) > 1000:
-                        memory_array = memory_array[-1000:]
-                    
-                    self.langgraph_memory.update_one(
-                        {"array_id": self.array_id},
-                        {
-                            "$set": {
-                                "memory_array": memory_array,
-                                "last_updated": datetime.utcnow(),
-                                "total_entries": len(memory_array)
-                            }
-                        }
-                    )
-                    logger.info(f"Added entry to LangGraph memory array for thread {thread_id}")
-                else:
+            if self._is_duplicate_entry(array_doc.get("memory_array", []), user_query, response):
+                logger.info(f"Skipped duplicate entry for thread {thread_id}")
+            else:
+                self.langgraph_memory.update_one(
+                    {"array_id": array_id},
+                    self._append_update([entry]),
+                    upsert=True
+                )
+                logger.info(f"Added entry to LangGraph memory array for thread {thread_id}")
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to add entry to memory array: {e}")
+            return False
+    
+    def add_many_to_memory_array(self, thread_id: str, entries: List[Dict[str, Any]]) -> bool:
+        """
+        Add several entries for one thread with a single write.
+        
+        Entries are deduplicated against the stored tail and each other the
+        same way add_to_memory_array does, then pushed with one $each.
+        
+        Args:
+            thread_id: Unique thread identifier
+            entries: Dicts with user_query, response and an optional context
+        """
+        try:
+            if self.langgraph_memory is None:
+                # Fallback to in-memory storage, one entry at a time
+                return all([self.add_to_memory_array(thread_id, **entry) for entry in entries])
+            
+            array_id = self._array_id_for(thread_id)
+            array_doc = self.langgraph_memory.find_one(
+                {"array_id": array_id},
+                {"memory_array": {"$slice": -10}}
+            ) or {}
+            
+            recent = array_doc.get("memory_array", [])
+            new_entries = []
+            for item in entries:
+                if self._is_duplicate_entry(recent, item["user_query"], item["response"]):
                     logger.info(f"Skipped duplicate entry for thread {thread_id}")
-                
+                    continue
+                entry = self._new_entry(thread_id, item["user_query"], item["response"], item.get("context"))
+                new_entries.append(entry)
+                recent.append(entry.to_dict())
+            
+            if new_entries:
+                self.langgraph_memory.update_one(
+                    {"array_id": array_id},
+                    self._append_update(new_entries),
+                    upsert=True
+                )
+                logger.info(f"Added {len(new_entries)} entries to LangGraph memory array for thread {thread_id}")
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to add entries to memory array: {e}")
+            return False
+    
+    async def add_to_memory_array_async(self, thread_id: str, user_query: str, response: str,
+                                        context: Dict[str, Any] = None) -> bool:
+        """
+        Add a new entry to the memory array without blocking the event loop.
+        
+        Uses Motor when it is installed, otherwise runs add_to_memory_array
+        in a worker thread.
+        """
+        collection = self._connect_async()
+        if collection is None:
+            return await asyncio.to_thread(self.add_to_memory_array, thread_id, user_query, response, context)
+        
+        try:
+            entry = self._new_entry(thread_id, user_query, response, context)
+            array_id = self._array_id_for(thread_id)
+            array_doc = await collection.find_one(
+                {"array_id": array_id},
+                {"memory_array": {"$slice": -10}}
+            ) or {}
+            
+            if self._is_duplicate_entry(array_doc.get("memory_array", []), user_query, response):
+                logger.info(f"Skipped duplicate entry for thread {thread_id}")
             else:
-                # Create new array document
-                self.langgraph_memory.insert_one({
-                    "array_id": self.array_id,
-                    "memory_array": [entry],
-                    "created_at": datetime.utcnow(),
-                    "last_updated": datetime.utcnow(),
-                    "total_entries": 1
-                })
-                logger.info(f"Created new LangGraph memory array with entry for thread {thread_id}")
+                await collection.update_one(
+                    {"array_id": array_id},
+                    self._append_update([entry]),
+                    upsert=True
+                )
+                logger.info(f"Added entry to LangGraph memory array for thread {thread_id}")
             
             return True
             
@@ -166,6 +749,53 @@ class LangGraphMemoryManager:
             logger.error(f"Failed to add entry to memory array: {e}")
             return False
     
+    def _connect_async(self):
+        """Get the Motor collection for async access, or None if unavailable."""
+        if self.langgraph_memory is None or AsyncIOMotorClient is None:
+            return None
+        loop = asyncio.get_running_loop()
+        if self.async_langgraph_memory is None or self._async_loop is not loop:
+            self.async_langgraph_memory = _get_motor_client(self.mongodb_url).get_database().langgraph_memory
+            self._async_loop = loop
+        return self.async_langgraph_memory
+    
+    def _new_entry(self, thread_id: str, user_query: str, response: str,
+                   context: Dict[str, Any] = None) -> MemoryEntry:
+        """Create a memory array entry."""
+        return MemoryEntry(
+            thread_id=thread_id,
+            user_query=user_query,
+            response=response,
+            context=context or {},
+            timestamp=datetime.now(timezone.utc),
+            # time_ns() can repeat across fast successive calls, so the
+            # suffix is random rather than a clock reading
+            entry_id=f"{thread_id}_{uuid.uuid4().hex}"
+        )
+    
+    def _is_duplicate_entry(self, memory_array: List[Dict[str, Any]], user_query: str, response: str) -> bool:
+        """Check the last 10 entries for the same user_query with a similar response."""
+        return any(
+            existing_entry.get("user_query") == user_query and
+            self._is_similar_response(existing_entry.get("response", ""), response)
+            for existing_entry in memory_array[-10:]
+        )
+    
+    def _append_update(self, entries: List[MemoryEntry]) -> Dict[str, Any]:
+        """
+        Build the upsert that appends entries to an array document.
+        
+        The server keeps only the last 1000 entries via $slice, so the
+        array never has to be read back and rewritten in full. No entry count
+        is stored, since concurrent appends would race on it; readers count
+        the array itself.
+        """
+        return {
+            "$push": {"memory_array": {"$each": [entry.to_dict() for entry in entries], "$slice": -1000}},
+            "$currentDate": {"last_updated": True},
+            "$setOnInsert": {"created_at": entries[0].timestamp}
+        }
+    
     def _is_similar_response(self, response1: str, response2: str, similarity_threshold: float = 0.8) -> bool:
         """
         Check if two responses are similar to detect duplicates.
@@ -230,34 +860,59 @@ class LangGraphMemoryManager:
         """
         try:
             if self.langgraph_memory is None:
-                # Fallback to in-memory storage
-                global _in_memory_langgraph_array
+                # Fallback to in-memory storage, returning recent entries
                 if thread_id:
-                    filtered_array = [entry for entry in _in_memory_langgraph_array 
-                                    if entry.get("thread_id") == thread_id]
-                else:
-                    filtered_array = _in_memory_langgraph_array
-                
-                # Return recent entries
-                return filtered_array[-limit:] if filtered_array else []
+                    return _in_memory_thread_entries(thread_id, limit)
+                recent_entries = [entry.to_dict() for entry in
+                                  itertools.islice(reversed(_in_memory_entries.values()), limit)]
+                recent_entries.reverse()
+                return recent_entries
             
             # Get from MongoDB
-            array_doc = self.langgraph_memory.find_one({"array_id": self.array_id})
+            if thread_id:
+                memory_array = self._thread_tail(thread_id, limit)
+                
+                if memory_array is None:
+                    logger.info("No LangGraph memory array found")
+                    return []
+            else:
+                memory_array = self._all_entries()
             
-            if not array_doc:
-                logger.info("No LangGraph memory array found")
-                return []
+            # Return recent entries
+            recent_entries = memory_array[-limit:] if memory_array else []
             
-            memory_array = array_doc.get("memory_array", [])
+            logger.info(f"Retrieved {len(recent_entries)} memory context entries")
+            return recent_entries
             
-            # Filter by thread_id if provided
+        except Exception as e:
+            logger.error(f"Failed to get memory context: {e}")
+            return []
+    
+    async def get_memory_context_async(self, thread_id: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get memory context for follow-up questions without blocking the event loop.
+        
+        Uses Motor when it is installed, otherwise runs get_memory_context
+        in a worker thread.
+        """
+        collection = self._connect_async()
+        if collection is None:
+            return await asyncio.to_thread(self.get_memory_context, thread_id, limit)
+        
+        try:
             if thread_id:
-                memory_array = [entry for entry in memory_array 
-                              if entry.get("thread_id") == thread_id]
+                array_docs = await collection.aggregate(self._thread_tail_pipeline(thread_id, limit)).to_list(1)
+                memory_array = (array_docs[0].get("memory_array") or []) if array_docs else []
+            else:
+                cursor = collection.find(
+                    {"array_id": {"$regex": f"^{self.array_id}_"}},
+                    {"memory_array": 1}
+                )
+                memory_array = [entry async for array_doc in cursor
+                                for entry in array_doc.get("memory_array", [])]
+                memory_array.sort(key=lambda entry: entry.get("timestamp") or _EPOCH)
             
-            # Return recent entries
             recent_entries = memory_array[-limit:] if memory_array else []
-            
             logger.info(f"Retrieved {len(recent_entries)} memory context entries")
             return recent_entries
             
@@ -279,22 +934,29 @@ class LangGraphMemoryManager:
         try:
             if self.langgraph_memory is None:
                 # Fallback to in-memory storage
-                global _in_memory_langgraph_array
-                thread_entries = [entry for entry in _in_memory_langgraph_array 
-                                if entry.get("thread_id") == thread_id]
-                return thread_entries[-limit:] if thread_entries else []
-            
-            # Get from MongoDB
-            array_doc = self.langgraph_memory.find_one({"array_id": self.array_id})
+                return _in_memory_thread_entries(thread_id, limit)
             
-            if not array_doc:
-                return []
+            # Get only the thread's tail from MongoDB
+            return self._thread_tail(thread_id, limit) or []
             
-            memory_array = array_doc.get("memory_array", [])
-            thread_entries = [entry for entry in memory_array 
-                            if entry.get("thread_id") == thread_id]
-            
-            return thread_entries[-limit:] if thread_entries else []
+        except Exception as e:
+            logger.error(f"Failed to get conversation context: {e}")
+            return []
+    
+    async def get_conversation_context_async(self, thread_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get conversation context for a thread without blocking the event loop.
+        
+        Uses Motor when it is installed, otherwise runs get_conversation_context
+        in a worker thread.
+        """
+        collection = self._connect_async()
+        if collection is None:
+            return await asyncio.to_thread(self.get_conversation_context, thread_id, limit)
+        
+        try:
+            array_docs = await collection.aggregate(self._thread_tail_pipeline(thread_id, limit)).to_list(1)
+            return (array_docs[0].get("memory_array") or []) if array_docs else []
             
         except Exception as e:
             logger.error(f"Failed to get conversation context: {e}")
@@ -312,37 +974,18 @@ class LangGraphMemoryManager:
             List of relevant memory entries
         """
         try:
-            if self.langgraph_memory is None:
-                # Simple text search in in-memory array
-                global _in_memory_langgraph_array
-                query_lower = query.lower()
-                relevant_entries = []
-                
-                for entry in _in_memory_langgraph_array:
-                    user_query = entry.get("user_query", "").lower()
-                    response = entry.get("response", "").lower()
-                    
-                    if query_lower in user_query or query_lower in response:
-                        relevant_entries.append(entry)
-                
-                return relevant_entries[-limit:] if relevant_entries else []
-            
-            # MongoDB text search
-            array_doc = self.langgraph_memory.find_one({"array_id": self.array_id})
-            
-            if not array_doc:
-                return []
-            
-            memory_array = array_doc.get("memory_array", [])
-            query_lower = query.lower()
-            relevant_entries = []
+            pattern = _compile_search_pattern(query)
             
-            for entry in memory_array:
-                user_query = entry.get("user_query", "").lower()
-                response = entry.get("response", "").lower()
-                
-                if query_lower in user_query or query_lower in response:
-                    relevant_entries.append(entry)
+            if self.langgraph_memory is None:
+                # Simple text search in in-memory entries
+                relevant_entries = [entry.to_dict() for entry in _in_memory_entries.values()
+                                    if pattern.search(entry.user_query)
+                                    or pattern.search(entry.response)]
+            else:
+                # MongoDB text search across all buckets
+                relevant_entries = [entry for entry in self._all_entries()
+                                    if pattern.search(entry.get("user_query", ""))
+                                    or pattern.search(entry.get("response", ""))]
             
             return relevant_entries[-limit:] if relevant_entries else []
             
@@ -362,39 +1005,33 @@ class LangGraphMemoryManager:
         """
         try:
             if self.langgraph_memory is None:
-                # Clear in-memory array
-                global _in_memory_langgraph_array
+                # Clear in-memory entries
                 if thread_id:
-                    _in_memory_langgraph_array = [entry for entry in _in_memory_langgraph_array 
-                                                if entry.get("thread_id") != thread_id]
+                    for entry_id in _thread_index.pop(thread_id, []):
+                        _in_memory_entries.pop(entry_id, None)
                 else:
-                    _in_memory_langgraph_array = []
+                    _in_memory_entries.clear()
+                    _thread_index.clear()
                 logger.info(f"Cleared in-memory LangGraph array")
                 return True
             
             # Clear from MongoDB
             if thread_id:
-                # Clear specific thread
-                array_doc = self.langgraph_memory.find_one({"array_id": self.array_id})
-                if array_doc:
-                    memory_array = array_doc.get("memory_array", [])
-                    filtered_array = [entry for entry in memory_array 
-                                    if entry.get("thread_id") != thread_id]
-                    
-                    self.langgraph_memory.update_one(
-                        {"array_id": self.array_id},
-                        {
-                            "$set": {
-                                "memory_array": filtered_array,
-                                "last_updated": datetime.utcnow(),
-                                "total_entries": len(filtered_array)
-                            }
-                        }
-                    )
+                # Clear specific thread. $pull removes its entries server-side,
+                # so appends by other threads sharing the bucket are not lost.
+                array_id = self._array_id_for(thread_id)
+                result = self.langgraph_memory.update_one(
+                    {"array_id": array_id},
+                    {
+                        "$pull": {"memory_array": {"thread_id": thread_id}},
+                        "$currentDate": {"last_updated": True}
+                    }
+                )
+                if result.modified_count:
                     logger.info(f"Cleared memory for thread {thread_id}")
             else:
                 # Clear all memory
-                self.langgraph_memory.delete_one({"array_id": self.array_id})
+                self.langgraph_memory.delete_many({"array_id": {"$regex": f"^{self.array_id}_"}})
                 logger.info("Cleared all LangGraph memory")
             
             return True
@@ -412,34 +1049,40 @@ class LangGraphMemoryManager:
         """
         try:
             if self.langgraph_memory is None:
-                # Get stats from in-memory array
-                global _in_memory_langgraph_array
-                thread_count = len(set(entry.get("thread_id") for entry in _in_memory_langgraph_array))
+                # Get stats from in-memory entries
                 return {
-                    "total_entries": len(_in_memory_langgraph_array),
-                    "thread_count": thread_count,
+                    "total_entries": len(_in_memory_entries),
+                    "thread_count": len(_thread_index),
                     "storage_type": "in_memory"
                 }
             
-            # Get stats from MongoDB
-            array_doc = self.langgraph_memory.find_one({"array_id": self.array_id})
-            
-            if not array_doc:
+            # Get stats from MongoDB, aggregated over all buckets
+            pipeline = [
+                {"$match": {"array_id": {"$regex": f"^{self.array_id}_"}}},
+                {"$unwind": "$memory_array"},
+                {"$group": {
+                    "_id": None,
+                    "total_entries": {"$sum": 1},
+                    "threads": {"$addToSet": "$memory_array.thread_id"},
+                    "created_at": {"$min": "$created_at"},
+                    "last_updated": {"$max": "$last_updated"}
+                }}
+            ]
+            stats = next(self.langgraph_memory.aggregate(pipeline, allowDiskUse=True), None)
+            
+            if not stats:
                 return {
                     "total_entries": 0,
                     "thread_count": 0,
                     "storage_type": "mongodb"
                 }
             
-            memory_array = array_doc.get("memory_array", [])
-            thread_count = len(set(entry.get("thread_id") for entry in memory_array))
-            
             return {
-                "total_entries": len(memory_array),
-                "thread_count": thread_count,
+                "total_entries": stats["total_entries"],
+                "thread_count": len(stats["threads"]),
                 "storage_type": "mongodb",
-                "created_at": array_doc.get("created_at"),
-                "last_updated": array_doc.get("last_updated")
+                "created_at": stats.get("created_at"),
+                "last_updated": stats.get("last_updated")
             }
             
         except Exception as e:
@@ -447,10 +1090,9 @@ class LangGraphMemoryManager:
             return {"error": str(e)}
     
     def close(self):
-        """Close the MongoDB connection."""
+        """Release the manager; the shared MongoClient and Motor client stay open for reuse."""
         if self.client:
-            self.client.close()
-            logger.info("LangGraph Memory Manager connection closed")
+            logger.info("LangGraph Memory Manager closed")
 
 
 class SimpleMemoryManager:
@@ -469,28 +1111,16 @@ class SimpleMemoryManager:
     def save_conversation_memory(self, thread_id: str, state: Dict[str, Any]) -> bool:
         """Save conversation memory for a specific thread."""
         try:
+            from bson import ObjectId
             # Prepare conversation data
             conversation_data = {
+                # An ObjectId, like MongoDB's, so cursors parse the same way;
+                # its hex sorts in creation order within the process
+                "_id": str(ObjectId()),
                 "thread_id": thread_id,
-                "timestamp": datetime.utcnow().isoformat(),
-                "user_query": state.get("user_query", ""),
-                "current_step": state.get("current_step", 1),
-                "agent_history": state.get("agent_history", []),
-                "active_agent": state.get("active_agent", None),
-                "supervisor_decision": state.get("supervisor_decision", None),
-                "supervisor_reasoning": state.get("supervisor_reasoning", None),
-                "is_complete": state.get("is_complete", False),
-                "processing_time": state.get("processing_time", 0.0),
-                "final_answer": state.get("final_answer", ""),
-                "state_snapshot": {
-                    "domain_expert_analysis": state.get("domain_expert_analysis"),
-                    "ux_ui_specialist_analysis": state.get("ux_ui_specialist_analysis"),
-                    "technical_architect_analysis": state.get("technical_architect_analysis"),
-                    "revenue_model_analyst_analysis": state.get("revenue_model_analyst_analysis"),
-                    "moderator_aggregation": state.get("moderator_aggregation"),
-                    "debate_resolution": state.get("debate_resolution"),
-                    "final_answer": state.get("final_answer"),
-                }
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                **{key: state.get(key, default) for key, default in _CONV_FIELDS.items()},
+                "state_snapshot": {key: state.get(key) for key in _SNAPSHOT_FIELDS}
             }
             
             # Store in memory
@@ -505,13 +1135,21 @@ class SimpleMemoryManager:
             logger.error(f"Failed to save conversation memory: {e}")
             return False
     
-    def get_conversation_history(self, thread_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_conversation_history(self, thread_id: str, limit: int = 10,
+                                 include_snapshot: bool = False,
+                                 before: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve conversation history for a specific thread."""
         try:
             if thread_id not in _in_memory_conversations:
                 return []
             
-            history = _in_memory_conversations[thread_id][-limit:]  # Get last N entries
+            conversations = self._before(_in_memory_conversations[thread_id], before)
+            # Last N entries, newest first like the MongoDB manager
+            history = [
+                {**{key: value for key, value in conv.items() if key != "_id"},
+                 "cursor": _history_cursor(conv["timestamp"], conv["_id"])}
+                for conv in reversed(conversations[-limit:] if limit > 0 else [])
+            ]
             logger.info(f"Retrieved {len(history)} conversation history entries for thread {thread_id}")
             return history
             
@@ -519,25 +1157,42 @@ class SimpleMemoryManager:
             logger.error(f"Failed to retrieve conversation history: {e}")
             return []
     
-    def get_all_conversation_history(self, limit: int = 20) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _before(conversations: List[Dict[str, Any]], before: Optional[str]) -> List[Dict[str, Any]]:
+        """Keep the conversations older than a page cursor."""
+        if before is None:
+            return conversations
+        timestamp, entry_id = _parse_history_cursor(before)
+        position = (timestamp.isoformat(), str(entry_id))
+        return [conv for conv in conversations if (conv["timestamp"], conv["_id"]) < position]
+    
+    def get_conversation_history_iter(self, thread_id: str, limit: int = 10, batch_size: int = 20,
+                                      include_snapshot: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield conversation history for a specific thread one entry at a time."""
+        yield from self.get_conversation_history(thread_id, limit, include_snapshot)
+    
+    def get_all_conversation_history(self, limit: int = 20, include_snapshot: bool = False,
+                                     before: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve recent conversation history from all threads."""
         try:
             all_history = []
             for thread_id, conversations in _in_memory_conversations.items():
-                for conv in conversations[-5:]:  # Get last 5 from each thread
-                    all_history.append({
-                        "_id": f"{thread_id}_{conv.get('timestamp', '')}",
+                for conv in self._before(conversations, before)[-5:]:  # Get last 5 from each thread
+                    entry = {
+                        "cursor": _history_cursor(conv["timestamp"], conv["_id"]),
                         "thread_id": thread_id,
                         "user_query": conv.get("user_query", ""),
                         "final_answer": conv.get("final_answer", ""),
                         "processing_time": conv.get("processing_time", 0),
                         "query_type": "general",
-                        "timestamp": conv.get("timestamp", ""),
-                        "state_snapshot": conv.get("state_snapshot", {})
-                    })
+                        "timestamp": conv.get("timestamp", "")
+                    }
+                    if include_snapshot:
+                        entry["state_snapshot"] = conv.get("state_snapshot", {})
+                    all_history.append(entry)
             
             # Sort by timestamp and limit
-            all_history.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+            all_history.sort(key=lambda x: x["cursor"], reverse=True)
             all_history = all_history[:limit]
             
             logger.info(f"Retrieved {len(all_history)} conversation history entries from all threads")
@@ -552,7 +1207,7 @@ class SimpleMemoryManager:
         try:
             context_data = {
                 "thread_id": thread_id,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "context": context
             }
             
@@ -564,13 +1219,20 @@ class SimpleMemoryManager:
             logger.error(f"Failed to save memory context: {e}")
             return False
     
-    def get_memory_context(self, thread_id: str) -> Optional[Dict[str, Any]]:
+    def save_batch(self, thread_id: str, state: Dict[str, Any], context: Dict[str, Any]) -> bool:
+        """Save a conversation turn and its memory context together."""
+        return (self.save_conversation_memory(thread_id, state)
+                and self.save_memory_context(thread_id, context))
+    
+    def get_memory_context(self, thread_id: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """Retrieve the latest memory context for a specific thread."""
         try:
             if thread_id in _in_memory_context:
-                context = _in_memory_context[thread_id]
+                context = _in_memory_context[thread_id].get("context")
                 logger.info(f"Retrieved memory context for thread {thread_id}")
-                return context.get("context")
+                if fields is not None and context is not None:
+                    return {key: context[key] for key in fields if key in context}
+                return context
             else:
                 logger.info(f"No memory context found for thread {thread_id}")
                 return None
@@ -642,6 +1304,11 @@ class MongoDBMemoryManager:
         self.conversations = None
         self.checkpoints = None
         self.memory_context = None
+        self.async_db = None
+        self._async_loop = None
+        # Manager that serves the public methods: this one, or the simple
+        # manager when MongoDB is unavailable. Decided once, here.
+        self._backend = self
         
         # Try to connect to MongoDB, fallback to simple memory if fails
         try:
@@ -651,21 +1318,20 @@ class MongoDBMemoryManager:
             from pymongo.database import Database
             
             self._connect()
-            self._setup_indexes()
+            _setup_indexes_once(self)
             logger.info("MongoDB memory manager initialized successfully")
         except Exception as e:
             logger.warning(f"MongoDB connection failed, using simple memory manager: {e}")
             # Create a simple memory manager as fallback
-            self.simple_manager = SimpleMemoryManager()
-            self.conversations = self.simple_manager.conversations
-            self.checkpoints = self.simple_manager.checkpoints
-            self.memory_context = self.simple_manager.memory_context
+            self._backend = SimpleMemoryManager()
+            self.conversations = self._backend.conversations
+            self.checkpoints = self._backend.checkpoints
+            self.memory_context = self._backend.memory_context
     
     def _connect(self):
         """Establish connection to MongoDB."""
         try:
-            from pymongo import MongoClient
-            self.client = MongoClient(self.mongodb_url)
+            self.client = _get_mongo_client(self.mongodb_url)
             self.db = self.client.get_database()
             self.conversations = self.db.conversations
             self.checkpoints = self.db.checkpoints
@@ -681,20 +1347,19 @@ class MongoDBMemoryManager:
     def _setup_indexes(self):
         """Setup database indexes for performance."""
         try:
-            # Indexes for conversations collection
-            self.conversations.create_index("thread_id")
-            self.conversations.create_index("timestamp")
-            self.conversations.create_index([("thread_id", 1), ("timestamp", -1)])
+            # Indexes for conversations collection; recent_feed orders the
+            # cross-thread feed. Unbounded text such as user_query and
+            # final_answer is kept out of the key, so the index stays small.
+            _ensure_named_index(self.conversations, [("timestamp", -1), ("_id", -1)], "recent_feed")
+            _ensure_thread_timestamp_index(self.conversations)
             
             # Indexes for checkpoints collection
-            self.checkpoints.create_index("thread_id")
-            self.checkpoints.create_index("checkpoint_id")
-            self.checkpoints.create_index([("thread_id", 1), ("timestamp", -1)])
+            _ensure_checkpoint_indexes(self.checkpoints)
+            _ensure_thread_timestamp_index(self.checkpoints)
             
             # Indexes for memory context collection
-            self.memory_context.create_index("thread_id")
             self.memory_context.create_index("timestamp")
-            self.memory_context.create_index([("thread_id", 1), ("timestamp", -1)])
+            _ensure_thread_timestamp_index(self.memory_context)
             
             logger.info("Database indexes created successfully")
         except Exception as e:
@@ -719,42 +1384,26 @@ class MongoDBMemoryManager:
                 serialized[key] = self._serialize_enum(value)
         return serialized
     
+    def _conversation_document(self, thread_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the conversations document for a state."""
+        # Serialize state for MongoDB storage
+        serialized_state = self._serialize_state(state)
+        return _without_none({
+            "thread_id": thread_id,
+            **{key: serialized_state.get(key, default) for key, default in _CONV_FIELDS.items()},
+            "state_snapshot": _without_none({key: serialized_state.get(key) for key in _SNAPSHOT_FIELDS})
+        })
+    
     def save_conversation_memory(self, thread_id: str, state: Dict[str, Any]) -> bool:
         """Save conversation memory for a specific thread."""
         # If MongoDB is not available, use simple manager
-        if hasattr(self, 'simple_manager'):
-            return self.simple_manager.save_conversation_memory(thread_id, state)
+        if self._backend is not self:
+            return self._backend.save_conversation_memory(thread_id, state)
         
         try:
-            # Serialize state for MongoDB storage
-            serialized_state = self._serialize_state(state)
-            
-            # Prepare conversation data
-            conversation_data = {
-                "thread_id": thread_id,
-                "timestamp": datetime.utcnow(),
-                "user_query": serialized_state.get("user_query", ""),
-                "current_step": serialized_state.get("current_step", 1),
-                "agent_history": serialized_state.get("agent_history", []),
-                "active_agent": serialized_state.get("active_agent", None),
-                "supervisor_decision": serialized_state.get("supervisor_decision", None),
-                "supervisor_reasoning": serialized_state.get("supervisor_reasoning", None),
-                "is_complete": serialized_state.get("is_complete", False),
-                "processing_time": serialized_state.get("processing_time", 0.0),
-                "final_answer": serialized_state.get("final_answer", ""),
-                "state_snapshot": {
-                    "domain_expert_analysis": serialized_state.get("domain_expert_analysis"),
-                    "ux_ui_specialist_analysis": serialized_state.get("ux_ui_specialist_analysis"),
-                    "technical_architect_analysis": serialized_state.get("technical_architect_analysis"),
-                    "revenue_model_analyst_analysis": serialized_state.get("revenue_model_analyst_analysis"),
-                    "moderator_aggregation": serialized_state.get("moderator_aggregation"),
-                    "debate_resolution": serialized_state.get("debate_resolution"),
-                    "final_answer": serialized_state.get("final_answer"),
-                }
-            }
-            
-            # Insert into conversations collection
-            result = self.conversations.insert_one(conversation_data)
+            # Queue for a batched insert into the conversations collection
+            _write_buffer.add(self.conversations, self._conversation_document(thread_id, state))
+            _read_cache.invalidate(thread_id, "thread_summary")
             logger.info(f"Saved conversation memory for thread {thread_id}")
             return True
             
@@ -762,23 +1411,40 @@ class MongoDBMemoryManager:
             logger.error(f"Failed to save conversation memory: {e}")
             return False
     
-    def get_conversation_history(self, thread_id: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Retrieve conversation history for a specific thread."""
+    def get_conversation_history(self, thread_id: str, limit: int = 10,
+                                 include_snapshot: bool = False,
+                                 before: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve conversation history for a specific thread, newest first.
+        
+        Args:
+            thread_id: Thread identifier
+            limit: Maximum number of entries to return
+            include_snapshot: Also return agent_history and the state_snapshot
+                analyses, which make up most of each document
+            before: Only return entries older than this cursor; pass the
+                cursor of the last entry of a page to fetch the next one
+        """
         # If MongoDB is not available, use simple manager
-        if hasattr(self, 'simple_manager'):
-            return self.simple_manager.get_conversation_history(thread_id, limit)
+        if self._backend is not self:
+            return self._backend.get_conversation_history(thread_id, limit, include_snapshot, before)
         
         try:
             if self.conversations is None:
                 logger.error("Conversations collection not initialized")
                 return []
-                
+            
+            _write_buffer.flush()
+            projection = dict(_CONVERSATION_HISTORY_PROJECTION)
+            if include_snapshot:
+                projection.update({"agent_history": 1, "state_snapshot": 1})
+            
             cursor = self.conversations.find(
-                {"thread_id": thread_id},
-                {"_id": 0}  # Exclude MongoDB _id field
-            ).sort("timestamp", -1).limit(limit)
+                _history_filter(thread_id, before),
+                projection
+            ).sort(_HISTORY_SORT).limit(limit).batch_size(limit)
             
-            history = list(cursor)
+            history = _with_cursor(list(cursor))
             logger.info(f"Retrieved {len(history)} conversation history entries for thread {thread_id}")
             return history
             
@@ -786,25 +1452,78 @@ class MongoDBMemoryManager:
             logger.error(f"Failed to retrieve conversation history: {e}")
             return []
     
-    def get_all_conversation_history(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Retrieve recent conversation history from all threads."""
+    def get_conversation_history_iter(self, thread_id: str, limit: int = 10, batch_size: int = 20,
+                                      include_snapshot: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Yield conversation history for a specific thread one entry at a time.
+        
+        Unlike get_conversation_history the cursor is never materialized, so
+        only batch_size decoded documents are held at once. Prefer this for
+        large limits or when include_snapshot is set.
+        
+        Args:
+            thread_id: Thread identifier
+            limit: Maximum number of entries to yield
+            batch_size: Documents fetched per round trip
+            include_snapshot: Also yield agent_history and the state_snapshot
+        """
+        # If MongoDB is not available, use simple manager
+        if self._backend is not self:
+            yield from self._backend.get_conversation_history_iter(thread_id, limit, batch_size, include_snapshot)
+            return
+        
+        try:
+            if self.conversations is None:
+                logger.error("Conversations collection not initialized")
+                return
+            
+            _write_buffer.flush()
+            projection = dict(_CONVERSATION_HISTORY_PROJECTION)
+            if include_snapshot:
+                projection.update({"agent_history": 1, "state_snapshot": 1})
+            
+            cursor = self.conversations.find(
+                {"thread_id": thread_id},
+                projection
+            ).sort(_HISTORY_SORT).limit(limit).batch_size(batch_size)
+            
+            with cursor:
+                for entry in cursor:
+                    yield _with_cursor([entry])[0]
+            
+        except Exception as e:
+            logger.error(f"Failed to stream conversation history: {e}")
+    
+    def get_all_conversation_history(self, limit: int = 20, include_snapshot: bool = False,
+                                     before: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve recent conversation history from all threads.
+        
+        The recent_feed index serves the cursor range and the sort, so only
+        the limit returned documents are fetched. Pass the cursor of the last
+        entry as before to fetch the next page.
+        """
         # If MongoDB is not available, use simple manager
-        if hasattr(self, 'simple_manager'):
-            return self.simple_manager.get_all_conversation_history(limit)
+        if self._backend is not self:
+            return self._backend.get_all_conversation_history(limit, include_snapshot, before)
         
         try:
             if self.conversations is None:
                 logger.error("Conversations collection not initialized")
                 return []
-                
+            
+            _write_buffer.flush()
+            projection = {"_id": 1, "thread_id": 1, "user_query": 1, "final_answer": 1,
+                          "processing_time": 1, "query_type": 1, "timestamp": 1}
+            if include_snapshot:
+                projection["state_snapshot"] = 1
+            
             cursor = self.conversations.find(
-                {},
-                {"_id": 1, "thread_id": 1, "user_query": 1, "final_answer": 1, 
-                 "processing_time": 1, "query_type": 1, "timestamp": 1, 
-                 "state_snapshot": 1}
-            ).sort("timestamp", -1).limit(limit)
+                _history_filter(before=before),
+                projection
+            ).hint("recent_feed").sort(_HISTORY_SORT).limit(limit).batch_size(limit)
             
-            history = list(cursor)
+            history = _with_cursor(list(cursor))
             logger.info(f"Retrieved {len(history)} conversation history entries from all threads")
             return history
             
@@ -815,8 +1534,8 @@ class MongoDBMemoryManager:
     def save_memory_context(self, thread_id: str, context: Dict[str, Any]) -> bool:
         """Save memory context for a specific thread."""
         # If MongoDB is not available, use simple manager
-        if hasattr(self, 'simple_manager'):
-            return self.simple_manager.save_memory_context(thread_id, context)
+        if self._backend is not self:
+            return self._backend.save_memory_context(thread_id, context)
         
         try:
             if self.memory_context is None:
@@ -825,11 +1544,11 @@ class MongoDBMemoryManager:
                 
             context_data = {
                 "thread_id": thread_id,
-                "timestamp": datetime.utcnow(),
                 "context": context
             }
             
-            result = self.memory_context.insert_one(context_data)
+            _write_buffer.add(self.memory_context, context_data)
+            _read_cache.invalidate(thread_id)
             logger.info(f"Saved memory context for thread {thread_id}")
             return True
             
@@ -837,64 +1556,146 @@ class MongoDBMemoryManager:
             logger.error(f"Failed to save memory context: {e}")
             return False
     
-    def get_memory_context(self, thread_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve the latest memory context for a specific thread."""
+    def save_batch(self, thread_id: str, state: Dict[str, Any], context: Dict[str, Any]) -> bool:
+        """
+        Save a conversation turn and its memory context together.
+        
+        Both writes are queued at once, so they go out in the same write-buffer
+        flush as one unordered bulk_write per collection.
+        
+        Args:
+            thread_id: Thread the turn belongs to
+            state: Graph state to save as conversation memory
+            context: Memory context to save for the thread
+        """
+        # If MongoDB is not available, use simple manager
+        if self._backend is not self:
+            return self._backend.save_batch(thread_id, state, context)
+        
+        try:
+            _write_buffer.add_many([
+                (self.conversations, self._conversation_document(thread_id, state)),
+                (self.memory_context, {"thread_id": thread_id, "context": context})
+            ])
+            _read_cache.invalidate(thread_id)
+            logger.info(f"Saved conversation memory and context for thread {thread_id}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to save conversation memory and context: {e}")
+            return False
+    
+    def get_memory_context(self, thread_id: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the latest memory context for a specific thread.
+        
+        Args:
+            thread_id: Thread to read the context for
+            fields: Optional context keys to return; only these are fetched
+                and decoded, the whole context is returned when omitted
+        """
         # If MongoDB is not available, use simple manager
-        if hasattr(self, 'simple_manager'):
-            return self.simple_manager.get_memory_context(thread_id)
+        if self._backend is not self:
+            return self._backend.get_memory_context(thread_id, fields)
         
         try:
             if self.memory_context is None:
                 logger.error("Memory context collection not initialized")
                 return None
-                
+            
+            cached = _read_cache.get("memory_context", thread_id, _CACHE_MISS)
+            if cached is not _CACHE_MISS:
+                if fields is not None and cached is not None:
+                    return {key: cached[key] for key in fields if key in cached}
+                return cached
+            
+            # thread_id keeps the projection inclusive even when fields is empty
+            projection = {"_id": 0, "thread_id": 1}
+            if fields is None:
+                projection["context"] = 1
+            else:
+                projection.update({f"context.{key}": 1 for key in fields})
+            
+            _write_buffer.flush()
             context = self.memory_context.find_one(
                 {"thread_id": thread_id},
-                {"_id": 0, "context": 1}
+                projection,
+                sort=[("timestamp", -1)]
             )
             
             if context:
                 logger.info(f"Retrieved memory context for thread {thread_id}")
-                return context.get("context")
+                context = context.get("context") or {}
             else:
                 logger.info(f"No memory context found for thread {thread_id}")
-                return None
+            
+            # Only whole contexts are cached so partial reads never shadow them
+            if fields is None:
+                _read_cache.set("memory_context", thread_id, context)
+            return context
                 
         except Exception as e:
             logger.error(f"Failed to retrieve memory context: {e}")
             return None
     
+    def _thread_summary_pipeline(self, thread_id: str) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation that returns the conversation count, latest
+        conversation and latest memory context in a single round trip.
+        """
+        return [
+            {"$match": {"thread_id": thread_id}},
+            {"$facet": {
+                "count": [{"$count": "n"}],
+                "latest": [{"$sort": {"timestamp": -1}}, {"$limit": 1}]
+            }},
+            {"$lookup": {
+                "from": self.memory_context.name,
+                "pipeline": [
+                    {"$match": {"thread_id": thread_id}},
+                    {"$sort": {"timestamp": -1}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, "context": 1}}
+                ],
+                "as": "memory_context"
+            }}
+        ]
+    
+    def _thread_summary_from_result(self, thread_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape the thread summary aggregation result."""
+        conversation_count = result["count"][0]["n"] if result.get("count") else 0
+        latest_conversation = result["latest"][0] if result.get("latest") else None
+        memory_context = result["memory_context"][0].get("context") if result.get("memory_context") else None
+        
+        return {
+            "thread_id": thread_id,
+            "conversation_count": conversation_count,
+            "latest_conversation": latest_conversation,
+            "memory_context": memory_context,
+            "last_updated": latest_conversation.get("timestamp") if latest_conversation else None
+        }
+    
     def get_thread_summary(self, thread_id: str) -> Dict[str, Any]:
         """Get a summary of a conversation thread."""
         # If MongoDB is not available, use simple manager
-        if hasattr(self, 'simple_manager'):
-            return self.simple_manager.get_thread_summary(thread_id)
+        if self._backend is not self:
+            return self._backend.get_thread_summary(thread_id)
         
         try:
             if self.conversations is None:
                 logger.error("Conversations collection not initialized")
                 return {"thread_id": thread_id, "error": "Database not connected"}
             
-            # Get conversation count
-            conversation_count = self.conversations.count_documents({"thread_id": thread_id})
+            cached = _read_cache.get("thread_summary", thread_id)
+            if cached is not None:
+                return cached
             
-            # Get latest conversation
-            latest_conversation = self.conversations.find_one(
-                {"thread_id": thread_id},
-                sort=[("timestamp", -1)]
-            )
-            
-            # Get memory context
-            memory_context = self.get_memory_context(thread_id)
-            
-            summary = {
-                "thread_id": thread_id,
-                "conversation_count": conversation_count,
-                "latest_conversation": latest_conversation,
-                "memory_context": memory_context,
-                "last_updated": latest_conversation.get("timestamp") if latest_conversation else None
-            }
+            _write_buffer.flush()
+            result = next(self.conversations.aggregate(self._thread_summary_pipeline(thread_id),
+                                                       allowDiskUse=False), {})
+            summary = self._thread_summary_from_result(thread_id, result)
             
+            _read_cache.set("thread_summary", thread_id, summary)
             return summary
             
         except Exception as e:
@@ -904,18 +1705,145 @@ class MongoDBMemoryManager:
     def clear_thread_memory(self, thread_id: str) -> bool:
         """Clear all memory for a specific thread."""
         # If MongoDB is not available, use simple manager
-        if hasattr(self, 'simple_manager'):
-            return self.simple_manager.clear_thread_memory(thread_id)
+        if self._backend is not self:
+            return self._backend.clear_thread_memory(thread_id)
         
         try:
             if (self.conversations is None or self.checkpoints is None or self.memory_context is None):
                 logger.error("Database collections not initialized")
                 return False
-                
-            # Delete from all collections
-            conversations_result = self.conversations.delete_many({"thread_id": thread_id})
-            checkpoints_result = self.checkpoints.delete_many({"thread_id": thread_id})
-            memory_result = self.memory_context.delete_many({"thread_id": thread_id})
+            
+            # Flush first so buffered writes cannot land after the delete
+            _write_buffer.flush()
+            
+            # Delete from all collections concurrently; the client is thread-safe
+            # and serves each delete from its own pooled connection
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [
+                    executor.submit(collection.delete_many, {"thread_id": thread_id})
+                    for collection in (self.conversations, self.checkpoints, self.memory_context)
+                ]
+            conversations_result, checkpoints_result, memory_result = (future.result() for future in futures)
+            _read_cache.invalidate(thread_id)
+            
+            logger.info(f"Cleared memory for thread {thread_id}: "
+                       f"{conversations_result.deleted_count} conversations, "
+                       f"{checkpoints_result.deleted_count} checkpoints, "
+                       f"{memory_result.deleted_count} memory contexts")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to clear thread memory: {e}")
+            return False
+    
+    def _connect_async(self):
+        """Get the Motor database for async access, or None if unavailable."""
+        if self._backend is not self or self.client is None or AsyncIOMotorClient is None:
+            return None
+        # Motor clients are bound to the loop they first ran on, and a shared
+        # manager can outlive a loop (e.g. successive asyncio.run calls)
+        loop = asyncio.get_running_loop()
+        if self.async_db is None or self._async_loop is not loop:
+            self.async_db = _get_motor_client(self.mongodb_url).get_database()
+            self._async_loop = loop
+        return self.async_db
+    
+    async def get_conversation_history_async(self, thread_id: str, limit: int = 10,
+                                             include_snapshot: bool = False,
+                                             before: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve conversation history without blocking the event loop.
+        
+        Uses Motor when it is installed, otherwise runs get_conversation_history
+        in a worker thread.
+        """
+        db = self._connect_async()
+        if db is None:
+            return await asyncio.to_thread(self.get_conversation_history, thread_id, limit, include_snapshot, before)
+        
+        try:
+            await asyncio.to_thread(_write_buffer.flush)
+            projection = dict(_CONVERSATION_HISTORY_PROJECTION)
+            if include_snapshot:
+                projection.update({"agent_history": 1, "state_snapshot": 1})
+            
+            cursor = db.conversations.find(
+                _history_filter(thread_id, before),
+                projection
+            ).sort(_HISTORY_SORT).limit(limit).batch_size(limit)
+            
+            history = _with_cursor(await cursor.to_list(length=limit))
+            logger.info(f"Retrieved {len(history)} conversation history entries for thread {thread_id}")
+            return history
+            
+        except Exception as e:
+            logger.error(f"Failed to retrieve conversation history: {e}")
+            return []
+    
+    async def get_memory_context_async(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve the latest memory context without blocking the event loop."""
+        db = self._connect_async()
+        if db is None:
+            return await asyncio.to_thread(self.get_memory_context, thread_id)
+        
+        try:
+            cached = _read_cache.get("memory_context", thread_id, _CACHE_MISS)
+            if cached is not _CACHE_MISS:
+                return cached
+            
+            await asyncio.to_thread(_write_buffer.flush)
+            context = await db.memory_context.find_one(
+                {"thread_id": thread_id},
+                {"_id": 0, "context": 1},
+                sort=[("timestamp", -1)]
+            )
+            context = (context.get("context") or {}) if context else None
+            
+            _read_cache.set("memory_context", thread_id, context)
+            return context
+            
+        except Exception as e:
+            logger.error(f"Failed to retrieve memory context: {e}")
+            return None
+    
+    async def get_thread_summary_async(self, thread_id: str) -> Dict[str, Any]:
+        """Get a summary of a conversation thread without blocking the event loop."""
+        db = self._connect_async()
+        if db is None:
+            return await asyncio.to_thread(self.get_thread_summary, thread_id)
+        
+        try:
+            cached = _read_cache.get("thread_summary", thread_id)
+            if cached is not None:
+                return cached
+            
+            await asyncio.to_thread(_write_buffer.flush)
+            cursor = db.conversations.aggregate(self._thread_summary_pipeline(thread_id), allowDiskUse=False)
+            results = await cursor.to_list(length=1)
+            summary = self._thread_summary_from_result(thread_id, results[0] if results else {})
+            
+            _read_cache.set("thread_summary", thread_id, summary)
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Failed to get thread summary: {e}")
+            return {"thread_id": thread_id, "error": str(e)}
+    
+    async def clear_thread_memory_async(self, thread_id: str) -> bool:
+        """Clear all memory for a specific thread without blocking the event loop."""
+        db = self._connect_async()
+        if db is None:
+            return await asyncio.to_thread(self.clear_thread_memory, thread_id)
+        
+        try:
+            # Flush first so buffered writes cannot land after the delete
+            await asyncio.to_thread(_write_buffer.flush)
+            
+            conversations_result, checkpoints_result, memory_result = await asyncio.gather(*(
+                collection.delete_many({"thread_id": thread_id})
+                for collection in (db.conversations, db.checkpoints, db.memory_context)
+            ))
+            _read_cache.invalidate(thread_id)
             
             logger.info(f"Cleared memory for thread {thread_id}: "
                        f"{conversations_result.deleted_count} conversations, "
@@ -928,12 +1856,17 @@ class MongoDBMemoryManager:
             return False
     
     def close(self):
-        """Close the MongoDB connection."""
-        if hasattr(self, 'simple_manager'):
-            self.simple_manager.close()
+        """
+        Flush buffered writes.
+        
+        The manager is shared per URL, so concurrent callers may still be using
+        it: its MongoClient and Motor client stay open and are closed at exit.
+        """
+        if self._backend is not self:
+            self._backend.close()
         elif self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed")
+            _write_buffer.flush()
+            logger.info("MongoDB memory manager closed")
 
 
 class MongoDBCheckpointSaver:
@@ -961,15 +1894,14 @@ class MongoDBCheckpointSaver:
             from pymongo.database import Database
             
             self._connect()
-            self._setup_indexes()
+            _setup_indexes_once(self)
         except Exception as e:
             logger.warning(f"MongoDB checkpoint connection failed: {e}")
     
     def _connect(self):
         """Establish connection to MongoDB."""
         try:
-            from pymongo import MongoClient
-            self.client = MongoClient(self.mongodb_url)
+            self.client = _get_mongo_client(self.mongodb_url)
             self.db = self.client.get_database()
             self.checkpoints = self.db.checkpoints
             
@@ -983,9 +1915,8 @@ class MongoDBCheckpointSaver:
     def _setup_indexes(self):
         """Setup database indexes for checkpoints."""
         try:
-            self.checkpoints.create_index("thread_id")
-            self.checkpoints.create_index("checkpoint_id")
-            self.checkpoints.create_index([("thread_id", 1), ("timestamp", -1)])
+            _ensure_checkpoint_indexes(self.checkpoints)
+            _ensure_thread_timestamp_index(self.checkpoints)
             logger.info("Checkpoint indexes created successfully")
         except Exception as e:
             logger.error(f"Failed to setup checkpoint indexes: {e}")
@@ -1001,8 +1932,10 @@ class MongoDBCheckpointSaver:
             if not thread_id:
                 return None
             
+            _write_buffer.flush()
             checkpoint = self.checkpoints.find_one(
                 {"thread_id": thread_id},
+                {"_id": 0, "checkpoint_data": 1},
                 sort=[("timestamp", -1)]
             )
             
@@ -1028,24 +1961,26 @@ class MongoDBCheckpointSaver:
                 logger.warning("No thread_id provided for checkpoint")
                 return
             
+            # The ObjectId is assigned client-side so the buffered insert
+            # stays idempotent if it is ever replayed
+            from bson import ObjectId
             checkpoint_data = {
+                "_id": ObjectId(),
                 "thread_id": thread_id,
-                "checkpoint_id": f"{thread_id}_{int(time.time())}",
-                "timestamp": datetime.utcnow(),
                 "checkpoint_data": checkpoint
             }
             
-            result = self.checkpoints.insert_one(checkpoint_data)
+            _write_buffer.add(self.checkpoints, checkpoint_data)
             logger.info(f"Saved checkpoint for thread {thread_id}")
             
         except Exception as e:
             logger.error(f"Failed to save checkpoint: {e}")
     
     def close(self):
-        """Close the MongoDB connection."""
+        """Release the saver; the shared MongoClient stays open for reuse."""
         if self.client:
-            self.client.close()
-            logger.info("MongoDB checkpoint connection closed")
+            _write_buffer.flush()
+            logger.info("MongoDB checkpoint saver closed")
 
 
 def create_mongodb_checkpoint_saver(mongodb_url: str = "mongodb://localhost:27017/Hackwave"):
@@ -1053,11 +1988,52 @@ def create_mongodb_checkpoint_saver(mongodb_url: str = "mongodb://localhost:2701
     return MongoDBCheckpointSaver(mongodb_url)
 
 
+_memory_managers: Dict[str, "MongoDBMemoryManager"] = {}  # mongodb_url -> connected manager
+_memory_managers_lock = threading.Lock()
+
+
 def create_memory_manager(mongodb_url: str = "mongodb://localhost:27017/Hackwave"):
-    """Factory function to create a MongoDB memory manager."""
-    return MongoDBMemoryManager(mongodb_url)
+    """
+    Factory function to get the MongoDB memory manager for a URL.
+    
+    A connected manager is built once per URL and reused, so repeat calls
+    skip the connection checks and index setup. A manager that fell back to
+    in-memory storage is not kept, so a later call retries MongoDB.
+    """
+    with _memory_managers_lock:
+        manager = _memory_managers.get(mongodb_url)
+        if manager is None:
+            manager = MongoDBMemoryManager(mongodb_url)
+            if manager._backend is manager:
+                _memory_managers[mongodb_url] = manager
+        return manager
+
+
+def _close_memory_managers() -> None:
+    """Flush every shared memory manager."""
+    with _memory_managers_lock:
+        for manager in _memory_managers.values():
+            manager.close()
+        _memory_managers.clear()
+
+
+# Registered after the client and write buffer hooks so it runs before them
+atexit.register(_close_memory_managers)
 
 
 def create_langgraph_memory_manager(mongodb_url: str = "mongodb://localhost:27017/Hackwave"):
     """Factory function to create a LangGraph Memory Manager."""
     return LangGraphMemoryManager(mongodb_url)
+
+
+async def create_async_langgraph_memory_manager(mongodb_url: str = "mongodb://localhost:27017/Hackwave"):
+    """
+    Factory function to create a LangGraph Memory Manager for async callers.
+    
+    The blocking connect and index setup run in a worker thread, and the
+    manager's Motor client is opened up front, so its *_async methods never
+    park the event loop on PyMongo I/O.
+    """
+    manager = await asyncio.to_thread(LangGraphMemoryManager, mongodb_url)
+    manager._connect_async()
+    return manager
@@ -57,6 +57,7 @@ class OverallState(TypedDict):
     active_agent: Optional[AgentType]
     supervisor_decision: Optional[SupervisorDecision]
     supervisor_reasoning: Optional[str]
+    supervisor_latency_ms: Optional[float]
     agent_history: List[Dict[str, Any]]
     current_step: int
     max_steps: int
@@ -1,27 +1,62 @@
 #!/usr/bin/env python3
 """
 Simple script to start the backend with proper flags for development.
+
+By default this runs `langgraph dev`, which serves the FastAPI app from
+langgraph.json together with the LangGraph server's graph endpoints
+(assistants, threads, runs) that LangGraph Studio and the SDK use.
+
+Pass --app-only to serve just the FastAPI app in-process with uvicorn on
+uvloop and the httptools parser. That starts faster because no subprocess
+re-imports the module tree, but the graph endpoints are not available.
 """
 
 import subprocess
 import sys
 import os
 
+def serve_app_only(backend_dir: str):
+    """Serve only the FastAPI app in this process with uvicorn."""
+    import uvicorn
+    
+    # Run from the backend directory so `src.agent` imports and .env resolve
+    os.chdir(backend_dir)
+    sys.path.insert(0, backend_dir)
+    
+    # uvicorn installs the uvloop policy itself when loop="uvloop"
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:  # uvloop is unavailable on Windows
+        loop = "asyncio"
+    
+    from src.agent.app import app
+    # http="auto" picks the httptools parser installed by uvicorn[standard]
+    uvicorn.run(app, host="0.0.0.0", port=2024, loop=loop, http="auto", workers=1)
+
 def main():
-    """Start the LangGraph backend with blocking allowed."""
-    print("🚀 Starting Multi-Agent Backend with blocking allowed...")
+    """Start the LangGraph backend with blocking allowed, or only the API app."""
+    app_only = "--app-only" in sys.argv[1:]
+    
+    print("🚀 Starting Multi-Agent Backend" + (" (API app only)..." if app_only else " with blocking allowed..."))
     print("📍 Backend will be available at: http://localhost:2024")
     print("🔗 API endpoints:")
     print("  - POST /api/refine-requirements")
     print("  - GET /api/health")
     print("  - GET /api/agents")
+    if app_only:
+        print("⚠️  LangGraph graph endpoints (assistants, threads, runs) are not served")
     print("")
     
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
     try:
-        # Start langgraph dev with --allow-blocking flag
-        subprocess.run([
-            sys.executable, "-m", "langgraph", "dev", "--allow-blocking"
-        ], cwd=os.path.dirname(__file__))
+        if app_only:
+            serve_app_only(backend_dir)
+        else:
+            # Start langgraph dev with --allow-blocking flag
+            subprocess.run([
+                sys.executable, "-m", "langgraph", "dev", "--allow-blocking"
+            ], cwd=backend_dir)
     except KeyboardInterrupt:
         print("\n👋 Backend stopped by user")
     except Exception as e:
@@ -3,74 +3,76 @@
 Simple test script to verify backend API connection and conversation history.
 """
 
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 import time
 
-def test_backend_connection():
+API_BASE_URL = "http://localhost:2024"
+
+async def test_backend_connection(client: httpx.AsyncClient):
     """Test if the backend is responding."""
-    try:
-        # Test health endpoint
-        response = requests.get("http://localhost:2024/api/health", timeout=5)
-        print(f"✅ Health check: {response.status_code}")
-        if response.status_code == 200:
-            print(f"Response: {response.json()}")
-        
-        # Test conversation history endpoint
-        test_thread_id = "test_thread_123"
-        response = requests.get(f"http://localhost:2024/api/conversation-history/{test_thread_id}", timeout=5)
-        print(f"✅ Conversation history: {response.status_code}")
-        if response.status_code == 200:
-            history = response.json()
-            print(f"History entries: {len(history)}")
-            for entry in history[:2]:  # Show first 2 entries
-                print(f"  - {entry.get('user_query', 'No query')} ({entry.get('timestamp', 'No timestamp')})")
-        
-        return True
-    except requests.exceptions.ConnectionError:
-        print("❌ Backend not responding on port 2024")
-        return False
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
+    # Health and conversation history are independent, so probe both at once
+    test_thread_id = "test_thread_123"
+    health_response, history_response = await asyncio.gather(
+        client.get("/api/health", timeout=5),
+        client.get(f"/api/conversation-history/{test_thread_id}", timeout=5)
+    )
+    
+    # Test health endpoint
+    print(f"✅ Health check: {health_response.status_code}")
+    assert health_response.status_code == 200, f"Health check returned {health_response.status_code}"
+    print(f"Response: {orjson.loads(health_response.content)}")
+    
+    # Test conversation history endpoint
+    print(f"✅ Conversation history: {history_response.status_code}")
+    assert history_response.status_code == 200, f"Conversation history returned {history_response.status_code}"
+    history = orjson.loads(history_response.content).get("history", [])
+    print(f"History entries: {len(history)}")
+    for entry in history[:2]:  # Show first 2 entries
+        print(f"  - {entry.get('user_query', 'No query')} ({entry.get('timestamp', 'No timestamp')})")
 
-def test_streaming_endpoint():
+async def test_streaming_endpoint(client: httpx.AsyncClient):
     """Test the streaming endpoint with thread_id."""
-    try:
-        test_data = {
-            "query": "I want to build a mobile app for food delivery",
-            "query_type": "general",
-            "thread_id": "test_thread_456"
-        }
-        
-        print("🔄 Testing streaming endpoint...")
-        response = requests.post(
-            "http://localhost:2024/api/refine-requirements/stream",
-            json=test_data,
-            headers={"Content-Type": "application/json"},
-            timeout=30,
-            stream=True
-        )
-        
-        if response.status_code == 200:
-            print("✅ Streaming endpoint working")
-            # Read a few lines to verify streaming
-            for i, line in enumerate(response.iter_lines()):
-                if i >= 5:  # Just read first 5 lines
-                    break
-                if line:
-                    print(f"  Stream: {line.decode()}")
-        else:
-            print(f"❌ Streaming endpoint failed: {response.status_code}")
-            
-    except Exception as e:
-        print(f"❌ Streaming test error: {e}")
+    test_data = {
+        "query": "I want to build a mobile app for food delivery",
+        "query_type": "general",
+        "thread_id": "test_thread_456"
+    }
+    
+    print("🔄 Testing streaming endpoint...")
+    async with client.stream(
+        "POST",
+        "/api/refine-requirements/stream",
+        content=orjson.dumps(test_data),
+        headers={"Content-Type": "application/json"},
+        timeout=30
+    ) as response:
+        assert response.status_code == 200, f"Streaming endpoint failed: {response.status_code}"
+        print("✅ Streaming endpoint working")
+        # Read a few lines to verify streaming
+        lines = []
+        async for line in response.aiter_lines():
+            if len(lines) >= 5:  # Just read first 5 lines
+                break
+            if line:
+                print(f"  Stream: {line}")
+            lines.append(line)
+        assert any(lines), "Streaming endpoint sent no data"
+
+async def main():
+    """Run the connection check, then the streaming test over one client."""
+    async with httpx.AsyncClient(base_url=API_BASE_URL) as client:
+        try:
+            await test_backend_connection(client)
+        except httpx.ConnectError:
+            print("❌ Backend not responding on port 2024")
+            print("Backend not available. Make sure to run 'cd backend && python start_backend.py'")
+            return
+        await test_streaming_endpoint(client)
 
 if __name__ == "__main__":
     print("🧪 Testing Backend API Connection")
     print("=" * 50)
     
-    if test_backend_connection():
-        test_streaming_endpoint()
-    else:
-        print("Backend not available. Make sure to run 'cd backend && langgraph dev --allow-blocking'")
+    asyncio.run(main())
@@ -3,112 +3,97 @@
 Test script to verify error fixes for LangGraph Memory System
 """
 
-import os
 import sys
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 
-# Add the src directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+API_BASE_URL = "http://localhost:2024"
 
-def test_backend_connection():
-    """Test if backend is running and responding."""
+def _error_body(response: httpx.Response):
+    """Return a failed response's body, decoded when it is JSON."""
     try:
-        response = requests.get("http://localhost:2024/api/health", timeout=5)
-        if response.status_code == 200:
-            print("✅ Backend is running and responding")
-            return True
-        else:
-            print(f"❌ Backend responded with status {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"❌ Backend connection failed: {e}")
-        return False
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return response.text
+
+async def test_backend_connection(client: httpx.AsyncClient):
+    """Test if backend is running and responding."""
+    response = await client.get("/api/health", timeout=5)
+    assert response.status_code == 200, f"Backend responded with status {response.status_code}"
+    print("✅ Backend is running and responding")
 
-def test_thread_context_endpoint():
+async def test_thread_context_endpoint(client: httpx.AsyncClient):
     """Test the thread-context endpoint that was causing errors."""
-    try:
-        thread_id = "test_thread_123"
-        response = requests.get(f"http://localhost:2024/api/thread-context/{thread_id}", timeout=10)
-        
-        print(f"📊 Thread context response status: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            print("✅ Thread context endpoint working")
-            print(f"   - Thread ID: {data.get('thread_id')}")
-            print(f"   - Has Context: {data.get('has_context')}")
-            print(f"   - Conversation Count: {data.get('conversation_count')}")
-            return True
-        else:
-            print(f"❌ Thread context endpoint failed: {response.status_code}")
-            try:
-                error_data = response.json()
-                print(f"   Error: {error_data}")
-            except:
-                print(f"   Error: {response.text}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Thread context test failed: {e}")
-        return False
+    thread_id = "test_thread_123"
+    response = await client.get(f"/api/thread-context/{thread_id}", timeout=10)
+    
+    print(f"📊 Thread context response status: {response.status_code}")
+    assert response.status_code == 200, (
+        f"Thread context endpoint failed: {response.status_code} {_error_body(response)}"
+    )
+    
+    data = orjson.loads(response.content)
+    print("✅ Thread context endpoint working")
+    print(f"   - Thread ID: {data.get('thread_id')}")
+    print(f"   - Has Context: {data.get('has_context')}")
+    print(f"   - Conversation Count: {data.get('conversation_count')}")
+    assert data.get("thread_id") == thread_id
+    assert "error" not in data, data.get("error")
 
-def test_langgraph_memory_endpoint():
+async def test_langgraph_memory_endpoint(client: httpx.AsyncClient):
     """Test the LangGraph memory endpoint."""
-    try:
-        thread_id = "test_thread_123"
-        response = requests.get(f"http://localhost:2024/api/langgraph-memory/{thread_id}", timeout=10)
-        
-        print(f"📊 LangGraph memory response status: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            print("✅ LangGraph memory endpoint working")
-            print(f"   - Memory Entries: {len(data.get('memory_entries', []))}")
-            print(f"   - Storage Type: {data.get('memory_stats', {}).get('storage_type', 'Unknown')}")
-            return True
-        else:
-            print(f"❌ LangGraph memory endpoint failed: {response.status_code}")
-            try:
-                error_data = response.json()
-                print(f"   Error: {error_data}")
-            except:
-                print(f"   Error: {response.text}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ LangGraph memory test failed: {e}")
-        return False
+    thread_id = "test_thread_123"
+    response = await client.get(f"/api/langgraph-memory/{thread_id}", timeout=10)
+    
+    print(f"📊 LangGraph memory response status: {response.status_code}")
+    assert response.status_code == 200, (
+        f"LangGraph memory endpoint failed: {response.status_code} {_error_body(response)}"
+    )
+    
+    data = orjson.loads(response.content)
+    print("✅ LangGraph memory endpoint working")
+    print(f"   - Memory Entries: {len(data.get('memory_entries', []))}")
+    print(f"   - Storage Type: {data.get('memory_stats', {}).get('storage_type', 'Unknown')}")
+    assert "error" not in data, data.get("error")
 
 def test_memory_manager_import():
     """Test if memory manager can be imported without errors."""
-    try:
-        from src.agent.memory import create_memory_manager, create_langgraph_memory_manager
-        
-        # Test regular memory manager
-        memory_manager = create_memory_manager()
-        print("✅ Regular memory manager created successfully")
-        
-        # Test LangGraph memory manager
-        langgraph_memory = create_langgraph_memory_manager()
-        print("✅ LangGraph memory manager created successfully")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Memory manager import failed: {e}")
-        return False
+    from src.agent.memory import create_memory_manager, create_langgraph_memory_manager
+    
+    # Test regular memory manager
+    assert create_memory_manager() is not None
+    print("✅ Regular memory manager created successfully")
+    
+    # Test LangGraph memory manager
+    assert create_langgraph_memory_manager() is not None
+    print("✅ LangGraph memory manager created successfully")
 
 def test_graph_import():
     """Test if graph can be imported without logger errors."""
-    try:
-        from src.agent.graph import supervisor_node
-        print("✅ Graph module imported successfully")
+    from src.agent.graph import supervisor_node
+    
+    assert callable(supervisor_node)
+    print("✅ Graph module imported successfully")
+
+async def run_endpoint_tests(endpoint_tests):
+    """Run the independent endpoint probes concurrently over one client."""
+    async with httpx.AsyncClient(base_url=API_BASE_URL, timeout=10) as client:
+        return await asyncio.gather(
+            *(test_func(client) for _, test_func in endpoint_tests),
+            return_exceptions=True
+        )
+
+def _report(test_name: str, error) -> bool:
+    """Print one test's outcome and return whether it passed."""
+    if error is None:
+        print(f"✅ {test_name} PASSED")
         return True
-        
-    except Exception as e:
-        print(f"❌ Graph import failed: {e}")
-        return False
+    if isinstance(error, AssertionError):
+        print(f"❌ {test_name} FAILED: {error}")
+    else:
+        print(f"❌ {test_name} ERROR: {error}")
+    return False
 
 def main():
     """Run all tests."""
@@ -118,26 +103,33 @@ def main():
     tests = [
         ("Memory Manager Import", test_memory_manager_import),
         ("Graph Import", test_graph_import),
+    ]
+    endpoint_tests = [
         ("Backend Connection", test_backend_connection),
         ("Thread Context Endpoint", test_thread_context_endpoint),
         ("LangGraph Memory Endpoint", test_langgraph_memory_endpoint),
     ]
     
     passed = 0
-    total = len(tests)
+    total = len(tests) + len(endpoint_tests)
     
     for test_name, test_func in tests:
         print(f"\n🔍 Testing: {test_name}")
         print("-" * 40)
         
         try:
-            if test_func():
-                passed += 1
-                print(f"✅ {test_name} PASSED")
-            else:
-                print(f"❌ {test_name} FAILED")
+            test_func()
+            error = None
         except Exception as e:
-            print(f"❌ {test_name} ERROR: {e}")
+            error = e
+        passed += _report(test_name, error)
+    
+    print(f"\n🔍 Testing endpoints concurrently: {', '.join(name for name, _ in endpoint_tests)}")
+    print("-" * 40)
+    results = asyncio.run(run_endpoint_tests(endpoint_tests))
+    
+    for (test_name, _), result in zip(endpoint_tests, results):
+        passed += _report(test_name, result)
     
     print(f"\n📊 Test Results: {passed}/{total} tests passed")
     
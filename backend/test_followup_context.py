@@ -5,39 +5,92 @@ Tests if the context is properly maintained between queries.
 """
 
 import asyncio
+import logging
+import os
 import time
-import uuid
+
+import pytest
+from pymongo.errors import PyMongoError
 from src.agent.memory import create_langgraph_memory_manager, create_memory_manager
-from src.agent.graph import graph
+from graph_test_helpers import THREAD_BASE_STATE, configure_script_logging, stream_graph, tid
 from src.agent.state import OverallState
 
+log = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.skipif(not os.getenv("GEMINI_API_KEY"), reason="GEMINI_API_KEY is not set")
+
+
+def _watch_conversations(memory_manager, thread_id: str):
+    """
+    Open a change stream on a thread's conversation writes.
+    
+    Returns None when the manager is not backed by MongoDB or the server is a
+    standalone without change streams; callers then re-read the history.
+    """
+    collection = memory_manager.conversations
+    if not hasattr(collection, "watch"):
+        return None
+    try:
+        return collection.watch(
+            [{"$match": {"fullDocument.thread_id": thread_id}}],
+            full_document="updateLookup",
+            max_await_time_ms=500
+        )
+    except PyMongoError as e:
+        log.info("  ⚠️ Change streams unavailable, falling back to re-reads: %s", e)
+        return None
+
+
+def _drain_changes(stream, timeout: float = 5.0):
+    """Wait up to timeout seconds for change events, then take all that are queued."""
+    changes = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        change = stream.try_next()
+        if change is not None:
+            changes.append(change)
+        elif changes:
+            break
+    return changes
+
+
+async def _check_regular_memory(memory_manager, stream, thread_id: str) -> str:
+    """Assert the run was saved to regular memory, from the change stream when there is one."""
+    if stream is None:
+        history = await asyncio.to_thread(memory_manager.get_conversation_history, thread_id, 5)
+        assert history, "The run was not saved to regular memory"
+        return f"{len(history)} entries"
+    
+    # Each supervisor step saves once, so a run produces several events
+    changes = await asyncio.to_thread(_drain_changes, stream)
+    assert changes, "No regular memory write was observed"
+    last_document = changes[-1]["fullDocument"]
+    assert last_document["thread_id"] == thread_id, "The observed write belongs to another thread"
+    return f"{len(changes)} writes observed (last step {last_document.get('current_step')})"
+
 
 async def test_followup_context():
     """Test if follow-up queries have proper context."""
-    print("🔄 Testing Follow-up Context Functionality...")
+    log.info("🔄 Testing Follow-up Context Functionality...")
     
     # Generate test thread ID
-    thread_id = f"followup_test_{uuid.uuid4().hex[:8]}"
-    print(f"📝 Using thread ID: {thread_id}")
+    thread_id = tid("followup_test")
+    log.info("📝 Using thread ID: %s", thread_id)
+    
+    # One manager of each kind for the whole test
+    memory_manager, langgraph_memory = await asyncio.gather(
+        asyncio.to_thread(create_memory_manager),
+        asyncio.to_thread(create_langgraph_memory_manager)
+    )
+    
+    # Subscribe before the first write so no conversation save is missed
+    stream = await asyncio.to_thread(_watch_conversations, memory_manager, thread_id)
     
     try:
         # Test 1: First query
-        print(f"\n📝 Test 1: First query")
+        log.info("\n📝 Test 1: First query")
         
-        initial_state = OverallState(
-            user_query="Create a mobile app for food delivery",
-            query_type=None,
-            debate_content=None,
-            current_step=1,
-            max_steps=10,
-            agent_history=[],
-            active_agent=None,
-            supervisor_decision=None,
-            supervisor_reasoning=None,
-            is_complete=False,
-            processing_time=0.0,
-            final_answer=None
-        )
+        initial_state: OverallState = {**THREAD_BASE_STATE, "user_query": "Create a mobile app for food delivery", "agent_history": []}
         
         config = {
             "configurable": {
@@ -48,94 +101,82 @@ async def test_followup_context():
             }
         }
         
-        print("  🔄 Executing first query...")
-        result = await graph.ainvoke(initial_state, config)
+        log.info("  🔄 Executing first query...")
+        result, initial_agents = await stream_graph(initial_state, config, log=log)
         
-        print(f"  ✅ First query completed")
-        print(f"  📊 Final answer length: {len(result.get('final_answer', ''))}")
+        log.info("  ✅ First query completed")
+        log.info("  🧭 Agents routed: %s", ', '.join(initial_agents) or 'none')
+        log.info("  📊 Final answer length: %s", len(result.get('final_answer', '')))
+        assert result.get('final_answer'), "The first query produced no final answer"
         
         # Check if data was saved to both memory systems
-        print(f"\n🔍 Checking memory storage...")
-        
-        # Check regular memory
-        memory_manager = create_memory_manager()
-        history = memory_manager.get_conversation_history(thread_id, limit=5)
-        print(f"  📊 Regular memory entries: {len(history)}")
+        log.info("\n🔍 Checking memory storage...")
         
-        # Check LangGraph memory
-        langgraph_memory = create_langgraph_memory_manager()
-        langgraph_entries = langgraph_memory.get_conversation_context(thread_id, limit=5)
-        print(f"  📊 LangGraph memory entries: {len(langgraph_entries)}")
-        
-        memory_manager.close()
-        langgraph_memory.close()
+        # Check regular and LangGraph memory concurrently
+        regular_memory, langgraph_entries = await asyncio.gather(
+            _check_regular_memory(memory_manager, stream, thread_id),
+            asyncio.to_thread(langgraph_memory.get_conversation_context, thread_id, 5)
+        )
+        log.info("  📊 Regular memory: %s", regular_memory)
+        log.info("  📊 LangGraph memory entries: %s", len(langgraph_entries))
         
         # Test 2: Follow-up query
-        print(f"\n📝 Test 2: Follow-up query")
+        log.info("\n📝 Test 2: Follow-up query")
         
-        followup_state = OverallState(
-            user_query="What about the payment system?",
-            query_type=None,
-            debate_content=None,
-            current_step=1,
-            max_steps=10,
-            agent_history=[],
-            active_agent=None,
-            supervisor_decision=None,
-            supervisor_reasoning=None,
-            is_complete=False,
-            processing_time=0.0,
-            final_answer=None
-        )
+        followup_state: OverallState = {**THREAD_BASE_STATE, "user_query": "What about the payment system?", "agent_history": []}
         
-        print("  🔄 Executing follow-up query...")
-        followup_result = await graph.ainvoke(followup_state, config)
+        log.info("  🔄 Executing follow-up query...")
+        followup_result, followup_agents = await stream_graph(followup_state, config, log=log)
         
-        print(f"  ✅ Follow-up query completed")
-        print(f"  📊 Final answer length: {len(followup_result.get('final_answer', ''))}")
+        log.info("  ✅ Follow-up query completed")
+        log.info("  🧭 Agents routed: %s", ', '.join(followup_agents) or 'none')
+        log.info("  📊 Final answer length: %s", len(followup_result.get('final_answer', '')))
+        assert followup_result.get('final_answer'), "The follow-up produced no final answer"
         
         # Check if follow-up data was saved
-        print(f"\n🔍 Checking follow-up memory storage...")
+        log.info("\n🔍 Checking follow-up memory storage...")
         
-        # Check regular memory again
-        memory_manager = create_memory_manager()
-        history_after = memory_manager.get_conversation_history(thread_id, limit=5)
-        print(f"  📊 Regular memory entries after follow-up: {len(history_after)}")
-        
-        # Check LangGraph memory again
-        langgraph_memory = create_langgraph_memory_manager()
-        langgraph_entries_after = langgraph_memory.get_conversation_context(thread_id, limit=5)
-        print(f"  📊 LangGraph memory entries after follow-up: {len(langgraph_entries_after)}")
+        # Check regular and LangGraph memory again, concurrently
+        regular_memory_after, langgraph_entries_after = await asyncio.gather(
+            _check_regular_memory(memory_manager, stream, thread_id),
+            asyncio.to_thread(langgraph_memory.get_conversation_context, thread_id, 5)
+        )
+        log.info("  📊 Regular memory after follow-up: %s", regular_memory_after)
+        log.info("  📊 LangGraph memory entries after follow-up: %s", len(langgraph_entries_after))
+        assert len(langgraph_entries_after) > len(langgraph_entries), "The follow-up was not stored in LangGraph memory"
         
         # Show the actual entries
-        print(f"\n📋 LangGraph Memory Entries:")
-        for i, entry in enumerate(langgraph_entries_after):
-            print(f"  Entry {i+1}:")
-            print(f"    Query: {entry.get('user_query', '')[:50]}...")
-            print(f"    Response: {entry.get('response', '')[:100]}...")
-            print(f"    Context keys: {list(entry.get('context', {}).keys())}")
-        
-        memory_manager.close()
-        langgraph_memory.close()
-        
-        print("\n✅ Follow-up Context Test completed successfully!")
-        
-    except Exception as e:
-        print(f"❌ Error during follow-up context test: {e}")
-        import traceback
-        traceback.print_exc()
+        log.info("\n📋 LangGraph Memory Entries:")
+        if log.isEnabledFor(logging.INFO):
+            for i, entry in enumerate(langgraph_entries_after):
+                log.info("  Entry %s:", i+1)
+                log.info("    Query: %s...", entry.get('user_query', '')[:50])
+                log.info("    Response: %s...", entry.get('response', '')[:100])
+                log.info("    Context keys: %s", list(entry.get('context', {}).keys()))
+        
+        log.info("\n✅ Follow-up Context Test completed successfully!")
+        
+    except Exception:
+        log.exception("❌ Error during follow-up context test")
+        raise
+    
+    finally:
+        if stream is not None:
+            await asyncio.to_thread(stream.close)
+        await asyncio.gather(asyncio.to_thread(memory_manager.close), asyncio.to_thread(langgraph_memory.close))
 
 
 async def main():
     """Run the follow-up context test."""
-    print("🚀 Starting Follow-up Context Test")
-    print("=" * 50)
+    log.info("🚀 Starting Follow-up Context Test")
+    log.info("=" * 50)
     
     await test_followup_context()
     
-    print("\n" + "=" * 50)
-    print("🎉 Follow-up Context Test Completed!")
+    log.info("\n" + "=" * 50)
+    log.info("🎉 Follow-up Context Test Completed!")
 
 
 if __name__ == "__main__":
+    configure_script_logging(log)
     asyncio.run(main())
@@ -7,167 +7,161 @@ instead of running all agents.
 
 import asyncio
 import json
+import logging
+import os
 import time
 from typing import Dict, Any
 
-from src.agent.graph import graph
-from src.agent.state import OverallState, QueryType, DebateCategory
+import pytest
+
+from graph_test_helpers import BASE_STATE, configure_script_logging, stream_graph
+from src.agent.state import OverallState
+
+log = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.skipif(not os.getenv("GEMINI_API_KEY"), reason="GEMINI_API_KEY is not set")
+
+
+# Follow-ups only carry set values; explicit None and [] writes would
+# overwrite whatever a checkpointed thread already holds
+_FOLLOWUP_BASE_STATE: OverallState = {key: value for key, value in BASE_STATE.items() if value is not None}
+
+
+async def _timed_invoke(state: OverallState):
+    """Stream the graph and return the result, its wall-clock time and routed agents."""
+    start_time = time.time()
+    result, observed_agents = await stream_graph(state, log=log)
+    return result, time.time() - start_time, observed_agents
 
 
 async def test_followup_functionality():
     """Test that follow-up questions are handled efficiently."""
     
-    print("🧪 Testing Follow-up Functionality")
-    print("=" * 50)
+    log.info("🧪 Testing Follow-up Functionality")
+    log.info("=" * 50)
     
     # Test 1: Initial query (should run full multi-agent analysis)
-    print("\n📝 Test 1: Initial Query (Full Analysis)")
-    print("-" * 30)
+    log.info("\n📝 Test 1: Initial Query (Full Analysis)")
+    log.info("-" * 30)
     
     initial_state: OverallState = {
+        **BASE_STATE,
         "messages": [],
         "user_query": "I want to build a SaaS application for project management",
-        "query_type": QueryType.GENERAL,
-        "debate_category": None,
-        "domain_expert_analysis": None,
-        "ux_ui_specialist_analysis": None,
-        "technical_architect_analysis": None,
-        "revenue_model_analyst_analysis": None,
-        "moderator_aggregation": None,
-        "debate_resolution": None,
-        "final_answer": None,
-        "processing_time": 0.0,
-        "active_agent": None,
-        "supervisor_decision": None,
-        "supervisor_reasoning": None,
-        "agent_history": [],
-        "current_step": 1,
-        "max_steps": 10,
-        "is_complete": False
+        "agent_history": []
     }
     
-    start_time = time.time()
-    result = await graph.ainvoke(initial_state)
-    initial_time = time.time() - start_time
-    
-    print(f"✅ Initial query completed in {initial_time:.2f} seconds")
-    print(f"📊 Agent history length: {len(result.get('agent_history', []))}")
-    print(f"🎯 Final answer length: {len(result.get('final_answer', ''))}")
+    result, initial_time, _ = await _timed_invoke(initial_state)
     
-    # Test 2: Follow-up revenue question (should route directly to revenue analyst)
-    print("\n💰 Test 2: Follow-up Revenue Question")
-    print("-" * 30)
+    log.info("✅ Initial query completed in %.2f seconds", initial_time)
+    log.info("📊 Agent history length: %s", len(result.get('agent_history', [])))
+    log.info("🎯 Final answer length: %s", len(result.get('final_answer', '')))
     
+    # Tests 2 and 3 only depend on the initial history, so both follow-ups
+    # are built from it and run concurrently
     followup_state: OverallState = {
-        "messages": [],
+        **_FOLLOWUP_BASE_STATE,
         "user_query": "How can I monetize this SaaS application and what pricing strategy should I use?",
-        "query_type": QueryType.GENERAL,
-        "debate_category": None,
-        "domain_expert_analysis": None,
-        "ux_ui_specialist_analysis": None,
-        "technical_architect_analysis": None,
-        "revenue_model_analyst_analysis": None,
-        "moderator_aggregation": None,
-        "debate_resolution": None,
-        "final_answer": None,
-        "processing_time": 0.0,
-        "active_agent": None,
-        "supervisor_decision": None,
-        "supervisor_reasoning": None,
-        "agent_history": result.get("agent_history", []),  # Include previous history
-        "current_step": 1,
-        "max_steps": 10,
-        "is_complete": False
+        # Each follow-up gets its own copy: nodes append to agent_history in place
+        "agent_history": list(result.get("agent_history", []))
     }
     
-    start_time = time.time()
-    followup_result = await graph.ainvoke(followup_state)
-    followup_time = time.time() - start_time
+    technical_followup_state: OverallState = {
+        **_FOLLOWUP_BASE_STATE,
+        "user_query": "What technology stack should I use for the backend and how should I handle scalability?",
+        # Each follow-up gets its own copy: nodes append to agent_history in place
+        "agent_history": list(result.get("agent_history", []))
+    }
     
-    print(f"✅ Follow-up revenue query completed in {followup_time:.2f} seconds")
-    print(f"📊 Agent history length: {len(followup_result.get('agent_history', []))}")
-    print(f"🎯 Final answer length: {len(followup_result.get('final_answer', ''))}")
+    (followup_result, followup_time, followup_agents), (technical_result, technical_time, technical_agents) = await asyncio.gather(
+        _timed_invoke(followup_state),
+        _timed_invoke(technical_followup_state)
+    )
+    
+    # Test 2: Follow-up revenue question (should route directly to revenue analyst)
+    log.info("\n💰 Test 2: Follow-up Revenue Question")
+    log.info("-" * 30)
+    
+    log.info("✅ Follow-up revenue query completed in %.2f seconds", followup_time)
+    log.info("📊 Agent history length: %s", len(followup_result.get('agent_history', [])))
+    log.info("🎯 Final answer length: %s", len(followup_result.get('final_answer', '')))
     
     # Check if it was routed to revenue analyst
-    agent_history = followup_result.get("agent_history", [])
     revenue_analysis = followup_result.get("revenue_model_analyst_analysis")
     
-    if revenue_analysis:
-        print("✅ Successfully routed to Revenue Model Analyst")
-        print(f"📈 Revenue analysis length: {len(revenue_analysis)}")
+    assert "revenue_model_analyst" in followup_agents and revenue_analysis, (
+        f"Not routed to Revenue Model Analyst (routed to {followup_agents})"
+    )
+    log.info("✅ Successfully routed to Revenue Model Analyst")
+    log.info("📈 Revenue analysis length: %s", len(revenue_analysis))
+    
+    # Clear-cut follow-ups are routed by pattern, so the supervisor should
+    # decide without an LLM round trip
+    supervisor_latency_ms = followup_result.get("supervisor_latency_ms")
+    if supervisor_latency_ms is not None and supervisor_latency_ms < 100:
+        log.info("✅ Supervisor decided in %.1f ms (pattern route)", supervisor_latency_ms)
     else:
-        print("❌ Not routed to Revenue Model Analyst")
+        log.info("❌ Supervisor did not take the pattern route (%s ms)", supervisor_latency_ms)
     
     # Test 3: Follow-up technical question (should route directly to technical architect)
-    print("\n⚙️ Test 3: Follow-up Technical Question")
-    print("-" * 30)
+    log.info("\n⚙️ Test 3: Follow-up Technical Question")
+    log.info("-" * 30)
     
-    technical_followup_state: OverallState = {
-        "messages": [],
-        "user_query": "What technology stack should I use for the backend and how should I handle scalability?",
-        "query_type": QueryType.GENERAL,
-        "debate_category": None,
-        "domain_expert_analysis": None,
-        "ux_ui_specialist_analysis": None,
-        "technical_architect_analysis": None,
-        "revenue_model_analyst_analysis": None,
-        "moderator_aggregation": None,
-        "debate_resolution": None,
-        "final_answer": None,
-        "processing_time": 0.0,
-        "active_agent": None,
-        "supervisor_decision": None,
-        "supervisor_reasoning": None,
-        "agent_history": followup_result.get("agent_history", []),  # Include previous history
-        "current_step": 1,
-        "max_steps": 10,
-        "is_complete": False
-    }
-    
-    start_time = time.time()
-    technical_result = await graph.ainvoke(technical_followup_state)
-    technical_time = time.time() - start_time
-    
-    print(f"✅ Follow-up technical query completed in {technical_time:.2f} seconds")
-    print(f"📊 Agent history length: {len(technical_result.get('agent_history', []))}")
-    print(f"🎯 Final answer length: {len(technical_result.get('final_answer', ''))}")
+    log.info("✅ Follow-up technical query completed in %.2f seconds", technical_time)
+    log.info("📊 Agent history length: %s", len(technical_result.get('agent_history', [])))
+    log.info("🎯 Final answer length: %s", len(technical_result.get('final_answer', '')))
     
     # Check if it was routed to technical architect
     technical_analysis = technical_result.get("technical_architect_analysis")
     
-    if technical_analysis:
-        print("✅ Successfully routed to Technical Architect")
-        print(f"🔧 Technical analysis length: {len(technical_analysis)}")
+    assert "technical_architect" in technical_agents and technical_analysis, (
+        f"Not routed to Technical Architect (routed to {technical_agents})"
+    )
+    log.info("✅ Successfully routed to Technical Architect")
+    log.info("🔧 Technical analysis length: %s", len(technical_analysis))
+    
+    # Test 4: Repeat the technical follow-up; with a semantic cache in front of
+    # the agents the identical query should come back almost immediately
+    cached_time = None
+    if os.getenv("SEMANTIC_CACHE_ENABLED"):
+        log.info("\n♻️ Test 4: Repeated Technical Question (Semantic Cache)")
+        log.info("-" * 30)
+        
+        # The first run appended to its state's history, so rerun from a fresh copy
+        _, cached_time, _ = await _timed_invoke({
+            **technical_followup_state,
+            "agent_history": list(result.get("agent_history", []))
+        })
+        log.info("✅ Repeated technical query completed in %.2f seconds", cached_time)
+        assert cached_time < technical_time * 0.2, (
+            f"Repeated query took {cached_time:.2f}s, expected a cache hit under {technical_time * 0.2:.2f}s"
+        )
     else:
-        print("❌ Not routed to Technical Architect")
+        log.info("\n⏭️ Skipping semantic cache check (SEMANTIC_CACHE_ENABLED not set)")
     
     # Performance comparison
-    print("\n📊 Performance Comparison")
-    print("-" * 30)
-    print(f"Initial query time: {initial_time:.2f} seconds")
-    print(f"Revenue follow-up time: {followup_time:.2f} seconds")
-    print(f"Technical follow-up time: {technical_time:.2f} seconds")
+    log.info("\n📊 Performance Comparison")
+    log.info("-" * 30)
+    log.info("Initial query time: %.2f seconds", initial_time)
+    log.info("Revenue follow-up time: %.2f seconds", followup_time)
+    log.info("Technical follow-up time: %.2f seconds", technical_time)
+    if cached_time is not None:
+        log.info("Repeated technical follow-up time: %.2f seconds", cached_time)
     
     if followup_time < initial_time * 0.7:  # Should be significantly faster
-        print("✅ Follow-up queries are significantly faster (good!)")
+        log.info("✅ Follow-up queries are significantly faster (good!)")
     else:
-        print("⚠️ Follow-up queries are not significantly faster")
+        log.info("⚠️ Follow-up queries are not significantly faster")
     
     # Summary
-    print("\n🎯 Summary")
-    print("-" * 30)
-    print("✅ Follow-up functionality test completed")
-    print("✅ Revenue questions routed to Revenue Model Analyst")
-    print("✅ Technical questions routed to Technical Architect")
-    print("✅ Follow-up queries completed faster than initial queries")
-    
-    return {
-        "initial_time": initial_time,
-        "followup_time": followup_time,
-        "technical_time": technical_time,
-        "success": True
-    }
+    log.info("\n🎯 Summary")
+    log.info("-" * 30)
+    log.info("✅ Follow-up functionality test completed")
+    log.info("✅ Revenue questions routed to Revenue Model Analyst")
+    log.info("✅ Technical questions routed to Technical Architect")
+    log.info("✅ Follow-up queries completed faster than initial queries")
 
 
 if __name__ == "__main__":
+    configure_script_logging(log)
     asyncio.run(test_followup_functionality())
@@ -1,105 +1,94 @@
 #!/usr/bin/env python3
 """
-Test script to isolate graph compilation issues.
-"""
+Tests that isolate graph compilation issues.
 
-import os
-import sys
-from dotenv import load_dotenv
+Run with pytest; the two tests share no state, so pytest-xdist can run them
+in separate worker processes.
+"""
 
-# Add the src directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+import functools
 
-# Load environment variables
-load_dotenv()
 
-def test_graph_compilation():
-    """Test graph compilation step by step."""
-    print("Testing graph compilation...")
+@functools.lru_cache(maxsize=None)
+def _build_test_graph():
+    """Build and compile the single-node test graph once; later calls reuse it."""
+    print("1. Importing required modules...")
+    from langgraph.graph import StateGraph, START, END
+    from src.agent.state import OverallState
+    from src.agent.configuration import Configuration
+    from langgraph.checkpoint.memory import MemorySaver
+    print("✅ Imports successful")
+    
+    print("2. Creating StateGraph...")
+    builder = StateGraph(OverallState, config_schema=Configuration)
+    print("✅ StateGraph created")
+    
+    print("3. Adding simple test node...")
+    def test_node(state):
+        return {"user_query": "test", "is_complete": True}
+    
+    builder.add_node("test", test_node)
+    print("✅ Test node added")
+    
+    print("4. Adding edges...")
+    builder.add_edge(START, "test")
+    builder.add_edge("test", END)
+    print("✅ Edges added")
+    
+    print("5. Creating checkpoint saver...")
+    checkpoint_saver = MemorySaver()
+    print("✅ Checkpoint saver created")
     
-    try:
-        print("1. Importing required modules...")
-        from langgraph.graph import StateGraph, START, END
-        from src.agent.state import OverallState
-        from src.agent.configuration import Configuration
-        from langgraph.checkpoint.memory import MemorySaver
-        print("✅ Imports successful")
-        
-        print("2. Creating StateGraph...")
-        builder = StateGraph(OverallState, config_schema=Configuration)
-        print("✅ StateGraph created")
-        
-        print("3. Adding simple test node...")
-        def test_node(state):
-            return {"user_query": "test", "is_complete": True}
-        
-        builder.add_node("test", test_node)
-        print("✅ Test node added")
-        
-        print("4. Adding edges...")
-        builder.add_edge(START, "test")
-        builder.add_edge("test", END)
-        print("✅ Edges added")
-        
-        print("5. Creating checkpoint saver...")
-        checkpoint_saver = MemorySaver()
-        print("✅ Checkpoint saver created")
-        
-        print("6. Compiling graph...")
-        graph = builder.compile(
-            name="test-graph",
-            checkpointer=checkpoint_saver
-        )
-        print("✅ Graph compiled successfully")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Graph compilation failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    print("6. Compiling graph...")
+    graph = builder.compile(
+        name="test-graph",
+        checkpointer=checkpoint_saver
+    )
+    print("✅ Graph compiled successfully")
+    
+    return graph
 
-def test_supervisor_node():
-    """Test supervisor node specifically."""
-    print("\nTesting supervisor node...")
+def test_supervisor_node_accessible():
+    """The supervisor node imports without hanging and is callable."""
+    from src.agent.graph import supervisor_node
     
-    try:
-        print("1. Importing supervisor node...")
-        from src.agent.graph import supervisor_node
-        print("✅ Supervisor node imported")
-        
-        print("2. Testing supervisor node function...")
-        # This should not hang
-        print("✅ Supervisor node function accessible")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Supervisor node test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    assert callable(supervisor_node)
+
+def test_graph_compiles():
+    """A single-node graph compiles with a checkpoint saver."""
+    assert _build_test_graph() is not None
 
-def main():
-    """Main test function."""
-    print("🧪 Graph Compilation Test")
-    print("=" * 50)
+def test_route_followup_skips_new_queries():
+    """A new query that mentions pricing or the stack still goes to the supervisor LLM."""
+    from src.agent.graph import route_followup
     
-    # Test supervisor node first
-    if not test_supervisor_node():
-        print("\n❌ Supervisor node test failed")
-        return False
+    query = "Build a subscription app with revenue tiers on a scalable tech stack and infrastructure"
     
-    # Test graph compilation
-    if not test_graph_compilation():
-        print("\n❌ Graph compilation test failed")
-        return False
+    # First supervisor step of a new run: no history yet
+    assert route_followup({"user_query": query, "agent_history": [], "current_step": 1}) is None
     
-    print("\n🎉 All graph tests passed!")
-    return True
-
-if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    # Later supervisor steps of the same run carry the run's own history
+    history = [{"step": 1, "agent": "supervisor", "decision": "continue", "next_agent": "domain_expert"}]
+    assert route_followup({"user_query": query, "agent_history": history, "current_step": 2}) is None
+    assert route_followup({
+        "user_query": query,
+        "agent_history": history,
+        "current_step": 3,
+        "revenue_model_analyst_analysis": "Revenue analysis",
+    }) is None
 
+def test_route_followup_routes_first_followup_step():
+    """A follow-up's first supervisor step is routed by pattern."""
+    from src.agent.graph import route_followup
+    from src.agent.state import AgentType, SupervisorDecision
+    
+    history = [{"step": 1, "agent": "supervisor", "decision": "end", "next_agent": "moderator"}]
+    state = {"user_query": "What pricing should I use?", "agent_history": history, "current_step": 1}
+    
+    agent, decision, _ = route_followup(state)
+    assert agent == AgentType.REVENUE_MODEL_ANALYST
+    assert decision == SupervisorDecision.CONTINUE
+    
+    agent, decision, _ = route_followup({**state, "revenue_model_analyst_analysis": "Revenue analysis"})
+    assert agent == AgentType.REVENUE_MODEL_ANALYST
+    assert decision == SupervisorDecision.END
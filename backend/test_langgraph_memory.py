@@ -5,27 +5,33 @@ Tests the new LangGraph memory manager that stores one big array in MongoDB.
 """
 
 import asyncio
+import logging
+import os
 import time
-import uuid
+
+import pytest
+
 from src.agent.memory import create_langgraph_memory_manager
-from src.agent.graph import graph
+from graph_test_helpers import THREAD_BASE_STATE, configure_script_logging, stream_graph, tid
 from src.agent.state import OverallState
 from src.agent.configuration import Configuration
 
+log = logging.getLogger(__name__)
 
-def test_langgraph_memory_manager():
+
+async def test_langgraph_memory_manager():
     """Test the LangGraph Memory Manager functionality."""
-    print("🧠 Testing LangGraph Memory Manager...")
+    log.info("🧠 Testing LangGraph Memory Manager...")
     
     # Create memory manager
-    memory_manager = create_langgraph_memory_manager()
+    memory_manager = await asyncio.to_thread(create_langgraph_memory_manager)
     
     # Generate test thread ID
-    thread_id = f"test_thread_{uuid.uuid4().hex[:8]}"
+    thread_id = tid("test_thread")
     
     try:
         # Test 1: Add entries to memory array
-        print(f"\n📝 Test 1: Adding entries to memory array for thread {thread_id}")
+        log.info("\n📝 Test 1: Adding entries to memory array for thread %s", thread_id)
         
         test_queries = [
             "Create a mobile app for food delivery",
@@ -43,108 +49,113 @@ def test_langgraph_memory_manager():
             "Push notifications will be implemented for order updates, promotions, and delivery status changes."
         ]
         
-        for i, (query, response) in enumerate(zip(test_queries, test_responses)):
-            context = {
-                "step": i + 1,
-                "agent": "test_agent",
-                "timestamp": time.time(),
-                "test_data": f"test_context_{i}"
+        built_entries = [
+            {
+                "user_query": query,
+                "response": response,
+                "context": {
+                    "step": i + 1,
+                    "seq": i,
+                    "agent": "test_agent",
+                    "timestamp": time.time(),
+                    "test_data": f"test_context_{i}"
+                }
             }
-            
-            success = memory_manager.add_to_memory_array(
-                thread_id=thread_id,
-                user_query=query,
-                response=response,
-                context=context
-            )
-            
-            print(f"  ✅ Added entry {i+1}: {success}")
-            time.sleep(0.1)  # Small delay
+            for i, (query, response) in enumerate(zip(test_queries, test_responses))
+        ]
+        
+        success = await asyncio.to_thread(memory_manager.add_many_to_memory_array, thread_id, built_entries)
+        log.info("  ✅ Added %s entries in one write: %s", len(built_entries), success)
+        assert success, "Adding the entries failed"
         
         # Test 2: Get memory context
-        print(f"\n🔍 Test 2: Retrieving memory context for thread {thread_id}")
-        memory_entries = memory_manager.get_conversation_context(thread_id, limit=10)
-        print(f"  📊 Retrieved {len(memory_entries)} memory entries")
+        log.info("\n🔍 Test 2: Retrieving memory context for thread %s", thread_id)
+        memory_entries = await asyncio.to_thread(memory_manager.get_conversation_context, thread_id, 10)
+        log.info("  📊 Retrieved %s memory entries", len(memory_entries))
+        assert len(memory_entries) == len(built_entries)
+        
+        if log.isEnabledFor(logging.INFO):
+            for i, entry in enumerate(memory_entries):
+                log.info("    Entry %s: %s...", i+1, entry.get('user_query', '')[:50])
         
-        for i, entry in enumerate(memory_entries):
-            print(f"    Entry {i+1}: {entry.get('user_query', '')[:50]}...")
+        # Entries keep insertion order, which the seq counter makes explicit
+        seqs = [entry.get("context", {}).get("seq") for entry in memory_entries]
+        log.info("  ✅ Entries in insertion order: %s", seqs == sorted(seqs))
+        assert seqs == sorted(seqs), f"Entries out of insertion order: {seqs}"
         
         # Test 3: Search memory
-        print(f"\n🔎 Test 3: Searching memory for 'payment'")
-        search_results = memory_manager.search_memory("payment", limit=5)
-        print(f"  📊 Found {len(search_results)} relevant entries")
+        log.info("\n🔎 Test 3: Searching memory for 'payment'")
+        search_results = await asyncio.to_thread(memory_manager.search_memory, "payment", 5)
+        log.info("  📊 Found %s relevant entries", len(search_results))
+        assert any("payment" in result.get('user_query', '').lower() for result in search_results)
         
-        for i, result in enumerate(search_results):
-            print(f"    Result {i+1}: {result.get('user_query', '')[:50]}...")
+        if log.isEnabledFor(logging.INFO):
+            for i, result in enumerate(search_results):
+                log.info("    Result %s: %s...", i+1, result.get('user_query', '')[:50])
         
         # Test 4: Get memory statistics
-        print(f"\n📈 Test 4: Getting memory statistics")
-        stats = memory_manager.get_memory_stats()
-        print(f"  📊 Memory Stats: {stats}")
+        log.info("\n📈 Test 4: Getting memory statistics")
+        stats = await asyncio.to_thread(memory_manager.get_memory_stats)
+        log.info("  📊 Memory Stats: %s", stats)
         
         # Test 5: Test with different thread
-        print(f"\n🔄 Test 5: Testing with different thread")
-        thread_id_2 = f"test_thread_2_{uuid.uuid4().hex[:8]}"
+        log.info("\n🔄 Test 5: Testing with different thread")
+        thread_id_2 = tid("test_thread_2")
         
-        success = memory_manager.add_to_memory_array(
+        success = await asyncio.to_thread(
+            memory_manager.add_to_memory_array,
             thread_id=thread_id_2,
             user_query="Different thread query",
             response="Different thread response",
             context={"test": "different_thread"}
         )
-        print(f"  ✅ Added entry to different thread: {success}")
+        log.info("  ✅ Added entry to different thread: %s", success)
+        assert success, "Adding the entry to the second thread failed"
         
         # Get context for both threads
-        entries_1 = memory_manager.get_conversation_context(thread_id, limit=5)
-        entries_2 = memory_manager.get_conversation_context(thread_id_2, limit=5)
-        print(f"  📊 Thread 1 entries: {len(entries_1)}, Thread 2 entries: {len(entries_2)}")
+        entries_1, entries_2 = await asyncio.gather(
+            asyncio.to_thread(memory_manager.get_conversation_context, thread_id, 5),
+            asyncio.to_thread(memory_manager.get_conversation_context, thread_id_2, 5)
+        )
+        log.info("  📊 Thread 1 entries: %s, Thread 2 entries: %s", len(entries_1), len(entries_2))
         
         # Test 6: Clear specific thread memory
-        print(f"\n🗑️ Test 6: Clearing memory for thread {thread_id_2}")
-        cleared = memory_manager.clear_memory(thread_id_2)
-        print(f"  ✅ Cleared thread 2 memory: {cleared}")
+        log.info("\n🗑️ Test 6: Clearing memory for thread %s", thread_id_2)
+        cleared = await asyncio.to_thread(memory_manager.clear_memory, thread_id_2)
+        log.info("  ✅ Cleared thread 2 memory: %s", cleared)
         
         # Verify thread 2 is cleared but thread 1 remains
-        entries_1_after = memory_manager.get_conversation_context(thread_id, limit=5)
-        entries_2_after = memory_manager.get_conversation_context(thread_id_2, limit=5)
-        print(f"  📊 After clearing - Thread 1: {len(entries_1_after)}, Thread 2: {len(entries_2_after)}")
+        entries_1_after, entries_2_after = await asyncio.gather(
+            asyncio.to_thread(memory_manager.get_conversation_context, thread_id, 5),
+            asyncio.to_thread(memory_manager.get_conversation_context, thread_id_2, 5)
+        )
+        log.info("  📊 After clearing - Thread 1: %s, Thread 2: %s", len(entries_1_after), len(entries_2_after))
+        assert cleared and not entries_2_after, "Thread 2 memory was not cleared"
+        assert entries_1_after == entries_1, "Clearing thread 2 changed thread 1"
         
-        print("\n✅ LangGraph Memory Manager tests completed successfully!")
+        log.info("\n✅ LangGraph Memory Manager tests completed successfully!")
         
-    except Exception as e:
-        print(f"❌ Error during LangGraph Memory Manager tests: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        log.exception("❌ Error during LangGraph Memory Manager tests")
+        raise
     
     finally:
-        memory_manager.close()
+        await asyncio.to_thread(memory_manager.close)
 
 
+@pytest.mark.skipif(not os.getenv("GEMINI_API_KEY"), reason="GEMINI_API_KEY is not set")
 async def test_langgraph_memory_with_graph():
     """Test LangGraph memory integration with the graph."""
-    print("\n🔄 Testing LangGraph Memory with Graph Integration...")
+    log.info("\n🔄 Testing LangGraph Memory with Graph Integration...")
     
     # Generate test thread ID
-    thread_id = f"graph_test_{uuid.uuid4().hex[:8]}"
+    thread_id = tid("graph_test")
     
     try:
         # Test 1: First query
-        print(f"\n📝 Test 1: First query for thread {thread_id}")
-        
-        initial_state = OverallState(
-            user_query="Create a social media app for photographers",
-            query_type=None,
-            debate_content=None,
-            current_step=1,
-            max_steps=10,
-            agent_history=[],
-            active_agent=None,
-            supervisor_decision=None,
-            supervisor_reasoning=None,
-            is_complete=False,
-            processing_time=0.0,
-            final_answer=None
-        )
+        log.info("\n📝 Test 1: First query for thread %s", thread_id)
+        
+        initial_state: OverallState = {**THREAD_BASE_STATE, "user_query": "Create a social media app for photographers", "agent_history": []}
         
         config = {
             "configurable": {
@@ -155,126 +166,114 @@ async def test_langgraph_memory_with_graph():
             }
         }
         
-        print("  🔄 Executing graph...")
-        result = await graph.ainvoke(initial_state, config)
+        log.info("  🔄 Executing graph...")
+        result, initial_agents = await stream_graph(initial_state, config, log=log)
         
-        print(f"  ✅ First query completed")
-        print(f"  📊 Final answer length: {len(result.get('final_answer', ''))}")
-        print(f"  📊 Processing time: {result.get('processing_time', 0):.2f}s")
+        log.info("  ✅ First query completed")
+        log.info("  🧭 Agents routed: %s", ', '.join(initial_agents) or 'none')
+        log.info("  📊 Final answer length: %s", len(result.get('final_answer', '')))
+        log.info("  📊 Processing time: %.2fs", result.get('processing_time', 0))
         
         # Test 2: Follow-up query
-        print(f"\n📝 Test 2: Follow-up query for thread {thread_id}")
-        
-        followup_state = OverallState(
-            user_query="What about the photo sharing features?",
-            query_type=None,
-            debate_content=None,
-            current_step=1,
-            max_steps=10,
-            agent_history=[],
-            active_agent=None,
-            supervisor_decision=None,
-            supervisor_reasoning=None,
-            is_complete=False,
-            processing_time=0.0,
-            final_answer=None
-        )
+        log.info("\n📝 Test 2: Follow-up query for thread %s", thread_id)
         
-        print("  🔄 Executing follow-up query...")
-        followup_result = await graph.ainvoke(followup_state, config)
+        followup_state: OverallState = {**THREAD_BASE_STATE, "user_query": "What about the photo sharing features?", "agent_history": []}
         
-        print(f"  ✅ Follow-up query completed")
-        print(f"  📊 Final answer length: {len(followup_result.get('final_answer', ''))}")
-        print(f"  📊 Processing time: {followup_result.get('processing_time', 0):.2f}s")
+        log.info("  🔄 Executing follow-up query...")
+        followup_result, followup_agents = await stream_graph(followup_state, config, log=log)
+        
+        log.info("  ✅ Follow-up query completed")
+        log.info("  🧭 Agents routed: %s", ', '.join(followup_agents) or 'none')
+        log.info("  📊 Final answer length: %s", len(followup_result.get('final_answer', '')))
+        log.info("  📊 Processing time: %.2fs", followup_result.get('processing_time', 0))
         
         # Test 3: Check LangGraph memory
-        print(f"\n🔍 Test 3: Checking LangGraph memory for thread {thread_id}")
+        log.info("\n🔍 Test 3: Checking LangGraph memory for thread %s", thread_id)
         
-        memory_manager = create_langgraph_memory_manager()
-        memory_entries = memory_manager.get_conversation_context(thread_id, limit=10)
+        memory_manager = await asyncio.to_thread(create_langgraph_memory_manager)
+        memory_entries = await asyncio.to_thread(memory_manager.get_conversation_context, thread_id, 10)
         
-        print(f"  📊 Found {len(memory_entries)} memory entries")
-        for i, entry in enumerate(memory_entries):
-            print(f"    Entry {i+1}: {entry.get('user_query', '')[:50]}...")
-            print(f"      Response: {entry.get('response', '')[:100]}...")
+        log.info("  📊 Found %s memory entries", len(memory_entries))
+        assert len(memory_entries) >= 2, "Both queries should be stored in LangGraph memory"
+        if log.isEnabledFor(logging.INFO):
+            for i, entry in enumerate(memory_entries):
+                log.info("    Entry %s: %s...", i+1, entry.get('user_query', '')[:50])
+                log.info("      Response: %s...", entry.get('response', '')[:100])
         
-        memory_manager.close()
+        await asyncio.to_thread(memory_manager.close)
         
-        print("\n✅ LangGraph Memory with Graph Integration tests completed successfully!")
+        log.info("\n✅ LangGraph Memory with Graph Integration tests completed successfully!")
         
-    except Exception as e:
-        print(f"❌ Error during Graph Integration tests: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        log.exception("❌ Error during Graph Integration tests")
+        raise
 
 
-def test_memory_persistence():
+async def test_memory_persistence():
     """Test that memory persists across different instances."""
-    print("\n💾 Testing Memory Persistence...")
+    log.info("\n💾 Testing Memory Persistence...")
     
-    thread_id = f"persistence_test_{uuid.uuid4().hex[:8]}"
+    thread_id = tid("persistence_test")
     
     try:
         # Create first instance and add data
-        print(f"\n📝 Adding data with first instance for thread {thread_id}")
-        memory_manager_1 = create_langgraph_memory_manager()
+        log.info("\n📝 Adding data with first instance for thread %s", thread_id)
+        memory_manager_1 = await asyncio.to_thread(create_langgraph_memory_manager)
         
-        success = memory_manager_1.add_to_memory_array(
+        success = await asyncio.to_thread(
+            memory_manager_1.add_to_memory_array,
             thread_id=thread_id,
             user_query="Persistence test query",
             response="Persistence test response",
             context={"test": "persistence"}
         )
-        print(f"  ✅ Added entry: {success}")
+        log.info("  ✅ Added entry: %s", success)
         
-        memory_manager_1.close()
+        await asyncio.to_thread(memory_manager_1.close)
         
         # Create second instance and retrieve data
-        print(f"\n🔍 Retrieving data with second instance for thread {thread_id}")
-        memory_manager_2 = create_langgraph_memory_manager()
+        log.info("\n🔍 Retrieving data with second instance for thread %s", thread_id)
+        memory_manager_2 = await asyncio.to_thread(create_langgraph_memory_manager)
         
-        entries = memory_manager_2.get_conversation_context(thread_id, limit=5)
-        print(f"  📊 Retrieved {len(entries)} entries")
+        entries = await asyncio.to_thread(memory_manager_2.get_conversation_context, thread_id, 5)
+        log.info("  📊 Retrieved %s entries", len(entries))
         
-        if entries:
-            print(f"  ✅ Data persisted successfully!")
-            print(f"  📝 First entry: {entries[0].get('user_query', '')}")
-        else:
-            print(f"  ❌ Data did not persist!")
+        assert entries, "Data did not persist"
+        log.info("  ✅ Data persisted successfully!")
+        log.info("  📝 First entry: %s", entries[0].get('user_query', ''))
         
-        memory_manager_2.close()
+        await asyncio.to_thread(memory_manager_2.close)
         
-        print("\n✅ Memory Persistence tests completed successfully!")
+        log.info("\n✅ Memory Persistence tests completed successfully!")
         
-    except Exception as e:
-        print(f"❌ Error during Memory Persistence tests: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        log.exception("❌ Error during Memory Persistence tests")
+        raise
 
 
 async def main():
     """Run all LangGraph memory tests."""
-    print("🚀 Starting LangGraph Memory System Tests")
-    print("=" * 50)
-    
-    # Test 1: Basic memory manager functionality
-    test_langgraph_memory_manager()
-    
-    # Test 2: Memory persistence
-    test_memory_persistence()
+    log.info("🚀 Starting LangGraph Memory System Tests")
+    log.info("=" * 50)
     
-    # Test 3: Graph integration
-    await test_langgraph_memory_with_graph()
+    # Basic functionality, persistence and graph integration each use their
+    # own fresh thread IDs, so the three phases run concurrently
+    await asyncio.gather(
+        test_langgraph_memory_manager(),
+        test_memory_persistence(),
+        test_langgraph_memory_with_graph()
+    )
     
-    print("\n" + "=" * 50)
-    print("🎉 All LangGraph Memory System Tests Completed!")
-    print("\n📋 Summary:")
-    print("  ✅ LangGraph Memory Manager functionality")
-    print("  ✅ Memory persistence across instances")
-    print("  ✅ Graph integration with memory context")
-    print("  ✅ Follow-up question handling")
-    print("  ✅ MongoDB storage with single array approach")
+    log.info("\n" + "=" * 50)
+    log.info("🎉 All LangGraph Memory System Tests Completed!")
+    log.info("\n📋 Summary:")
+    log.info("  ✅ LangGraph Memory Manager functionality")
+    log.info("  ✅ Memory persistence across instances")
+    log.info("  ✅ Graph integration with memory context")
+    log.info("  ✅ Follow-up question handling")
+    log.info("  ✅ MongoDB storage with single array approach")
 
 
 if __name__ == "__main__":
+    configure_script_logging(log)
     asyncio.run(main())
@@ -3,35 +3,42 @@
 Simple test script to verify MongoDB memory system functionality.
 """
 
+import logging
 import os
 import sys
 from dotenv import load_dotenv
 
-# Add the src directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-from src.agent.memory import create_memory_manager
+from graph_test_helpers import configure_script_logging
+# Imported as a module so pytest does not collect the connection test twice
+import test_mongodb_connection as mongodb_connection
+from src.agent.memory import _get_mongo_client, create_memory_manager
 
 # Load environment variables
 load_dotenv()
 
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/Hackwave")
+
+# Progress goes through logging so runs only pay for it when INFO is enabled;
+# failures are still printed immediately
+log = logging.getLogger(__name__)
+
 
-def test_memory_manager():
-    """Test the MongoDB memory manager functionality."""
-    print("🧪 Testing MongoDB Memory Manager")
-    print("=" * 50)
+def test_memory_manager(memory_manager):
+    """Test the MongoDB memory manager functionality.
+    
+    Args:
+        memory_manager: Memory manager on the shared MongoDB client
+    """
+    log.info("🧪 Testing MongoDB Memory Manager")
+    log.info("=" * 50)
+    
+    # Test thread IDs
+    test_thread_id = "test_thread_001"
+    different_thread_id = "test_thread_002"
     
     try:
-        # Create memory manager
-        print("1. Creating memory manager...")
-        memory_manager = create_memory_manager()
-        print("✅ Memory manager created successfully")
-        
-        # Test thread ID
-        test_thread_id = "test_thread_001"
-        
-        # Test saving conversation memory
-        print("\n2. Testing conversation memory save...")
+        # Test saving conversation memory and context in one batch
+        log.info("1. Testing conversation memory and context save...")
         test_state = {
             "user_query": "Test query for memory system",
             "current_step": 1,
@@ -40,120 +47,57 @@ def test_memory_manager():
             "is_complete": False,
             "processing_time": 1.5
         }
-        
-        success = memory_manager.save_conversation_memory(test_thread_id, test_state)
-        if success:
-            print("✅ Conversation memory saved successfully")
-        else:
-            print("❌ Failed to save conversation memory")
-            return False
-        
-        # Test retrieving conversation history
-        print("\n3. Testing conversation history retrieval...")
-        history = memory_manager.get_conversation_history(test_thread_id, limit=5)
-        if history:
-            print(f"✅ Retrieved {len(history)} conversation history entries")
-            for entry in history:
-                print(f"   - Query: {entry.get('user_query', 'N/A')}")
-                print(f"   - Step: {entry.get('current_step', 'N/A')}")
-        else:
-            print("❌ Failed to retrieve conversation history")
-            return False
-        
-        # Test saving memory context
-        print("\n4. Testing memory context save...")
         test_context = {
             "project_name": "Test Project",
             "user_preferences": ["feature1", "feature2"],
             "notes": "This is a test context"
         }
         
-        success = memory_manager.save_memory_context(test_thread_id, test_context)
-        if success:
-            print("✅ Memory context saved successfully")
-        else:
-            print("❌ Failed to save memory context")
-            return False
+        assert memory_manager.save_batch(test_thread_id, test_state, test_context), \
+            "Failed to save conversation memory and context"
+        log.info("✅ Conversation memory and context saved successfully")
+        
+        # Test retrieving conversation history
+        log.info("\n2. Testing conversation history retrieval...")
+        history = memory_manager.get_conversation_history(test_thread_id, limit=5)
+        assert history, "Failed to retrieve conversation history"
+        log.info("✅ Retrieved %s conversation history entries", len(history))
+        if log.isEnabledFor(logging.INFO):
+            for entry in history:
+                log.info("   - Query: %s", entry.get('user_query', 'N/A'))
+                log.info("   - Step: %s", entry.get('current_step', 'N/A'))
         
         # Test retrieving memory context
-        print("\n5. Testing memory context retrieval...")
+        log.info("\n3. Testing memory context retrieval...")
         context = memory_manager.get_memory_context(test_thread_id)
-        if context:
-            print("✅ Memory context retrieved successfully")
-            print(f"   - Project: {context.get('project_name', 'N/A')}")
-            print(f"   - Preferences: {context.get('user_preferences', [])}")
-        else:
-            print("❌ Failed to retrieve memory context")
-            return False
+        assert context, "Failed to retrieve memory context"
+        assert context.get('project_name') == "Test Project"
+        log.info("✅ Memory context retrieved successfully")
+        log.info("   - Project: %s", context.get('project_name', 'N/A'))
+        log.info("   - Preferences: %s", context.get('user_preferences', []))
         
         # Test thread summary
-        print("\n6. Testing thread summary...")
+        log.info("\n4. Testing thread summary...")
         summary = memory_manager.get_thread_summary(test_thread_id)
-        if summary:
-            print("✅ Thread summary retrieved successfully")
-            print(f"   - Thread ID: {summary.get('thread_id', 'N/A')}")
-            print(f"   - Conversation Count: {summary.get('conversation_count', 0)}")
-            print(f"   - Last Updated: {summary.get('last_updated', 'N/A')}")
-        else:
-            print("❌ Failed to retrieve thread summary")
-            return False
+        assert summary, "Failed to retrieve thread summary"
+        log.info("✅ Thread summary retrieved successfully")
+        log.info("   - Thread ID: %s", summary.get('thread_id', 'N/A'))
+        log.info("   - Conversation Count: %s", summary.get('conversation_count', 0))
+        log.info("   - Last Updated: %s", summary.get('last_updated', 'N/A'))
         
         # Test memory isolation with different thread
-        print("\n7. Testing memory isolation...")
-        different_thread_id = "test_thread_002"
+        log.info("\n5. Testing memory isolation...")
         different_history = memory_manager.get_conversation_history(different_thread_id, limit=5)
-        if not different_history:
-            print("✅ Memory isolation working correctly (no history for different thread)")
-        else:
-            print("❌ Memory isolation failed (found history for different thread)")
-            return False
-        
-        print("\n🎉 All memory manager tests passed!")
-        return True
+        assert not different_history, "Memory isolation failed (found history for different thread)"
+        log.info("✅ Memory isolation working correctly (no history for different thread)")
         
-    except Exception as e:
-        print(f"\n❌ Memory manager test failed with error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        log.info("\n🎉 All memory manager tests passed!")
     
     finally:
         # Clean up
-        try:
-            memory_manager.clear_thread_memory(test_thread_id)
-            memory_manager.clear_thread_memory(different_thread_id)
-            memory_manager.close()
-            print("\n🧹 Cleanup completed")
-        except Exception as e:
-            print(f"Warning: Cleanup failed: {e}")
-
-
-def test_mongodb_connection():
-    """Test MongoDB connection."""
-    print("\n🔌 Testing MongoDB Connection")
-    print("=" * 50)
-    
-    try:
-        from pymongo import MongoClient
-        
-        # Test connection
-        client = MongoClient("mongodb://localhost:27017/Hackwave")
-        client.admin.command('ping')
-        print("✅ MongoDB connection successful")
-        
-        # Test database access
-        db = client.get_database()
-        collections = db.list_collection_names()
-        print(f"✅ Database access successful. Collections: {collections}")
-        
-        client.close()
-        return True
-        
-    except Exception as e:
-        print(f"❌ MongoDB connection failed: {e}")
-        print("\n💡 Make sure MongoDB is running on localhost:27017")
-        print("   You can start MongoDB with: mongod")
-        return False
+        memory_manager.clear_thread_memory(test_thread_id)
+        memory_manager.clear_thread_memory(different_thread_id)
+        log.info("\n🧹 Cleanup completed")
 
 
 def main():
@@ -161,21 +105,35 @@ def main():
     print("🧪 LangGraph MongoDB Memory System Test")
     print("=" * 60)
     
+    # One client and manager for both checks, like the pytest fixtures
+    memory_manager = create_memory_manager(MONGODB_URL)
+    
     # Test MongoDB connection first
-    if not test_mongodb_connection():
+    try:
+        mongodb_connection.test_mongodb_connection(_get_mongo_client(MONGODB_URL))
+    except Exception as e:
+        print(f"❌ MongoDB connection failed: {e}")
+        print("\n💡 Make sure MongoDB is running on localhost:27017")
+        print("   You can start MongoDB with: mongod")
         print("\n❌ Cannot proceed without MongoDB connection")
         return False
     
     # Test memory manager
-    if test_memory_manager():
-        print("\n🎉 All tests passed! Memory system is working correctly.")
-        return True
-    else:
+    try:
+        test_memory_manager(memory_manager)
+    except Exception as e:
+        print(f"\n❌ Memory manager test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
         print("\n❌ Some tests failed. Please check the errors above.")
         return False
+    
+    print("\n🎉 All tests passed! Memory system is working correctly.")
+    return True
 
 
 if __name__ == "__main__":
+    configure_script_logging(log)
     success = main()
     sys.exit(0 if success else 1)
 
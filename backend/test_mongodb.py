@@ -3,37 +3,32 @@
 Simple MongoDB connection test script.
 """
 
-import sys
-import os
+from src.agent.memory import create_memory_manager
 
-# Add the src directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-try:
-    from agent.memory import create_memory_manager
-    print("✅ Memory manager imported successfully")
-    
-    # Test memory manager creation
-    mm = create_memory_manager()
-    print("✅ Memory manager created successfully")
+def test_memory_manager_collections(memory_manager):
+    """The memory manager is connected to its collections and can query them.
     
+    Args:
+        memory_manager: Memory manager on the shared MongoDB client
+    """
     # Test collections
-    print(f"✅ Conversations collection: {mm.conversations is not None}")
-    print(f"✅ Checkpoints collection: {mm.checkpoints is not None}")
-    print(f"✅ Memory context collection: {mm.memory_context is not None}")
+    print(f"✅ Conversations collection: {memory_manager.conversations is not None}")
+    print(f"✅ Checkpoints collection: {memory_manager.checkpoints is not None}")
+    print(f"✅ Memory context collection: {memory_manager.memory_context is not None}")
+    assert memory_manager.conversations is not None
+    assert memory_manager.checkpoints is not None
+    assert memory_manager.memory_context is not None
     
     # Test a simple query
+    history = memory_manager.get_conversation_history("test_thread", limit=1)
+    print(f"✅ Query test successful: {len(history)} results")
+
+
+if __name__ == "__main__":
     try:
-        history = mm.get_conversation_history("test_thread", limit=1)
-        print(f"✅ Query test successful: {len(history)} results")
+        mm = create_memory_manager()
+        print("✅ Memory manager created successfully")
+        test_memory_manager_collections(mm)
     except Exception as e:
-        print(f"❌ Query test failed: {e}")
-    
-    # Close connection
-    mm.close()
-    print("✅ Memory manager closed successfully")
-    
-except ImportError as e:
-    print(f"❌ Import error: {e}")
-except Exception as e:
-    print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}")
@@ -5,19 +5,22 @@ Test script for the Multi-Agent Product Requirements Refinement System.
 This script tests the basic functionality of the multi-agent system.
 """
 
+import asyncio
 import os
 import sys
-from pathlib import Path
 
-# Add the src directory to the Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+import pytest
 
-from agent.graph import graph
-from agent.state import OverallState, QueryType
+from src.agent.graph import graph
+from graph_cache import cached_ainvoke
+from graph_test_helpers import BASE_STATE, tid
+from src.agent.state import OverallState
 from langchain_core.messages import HumanMessage
 
+pytestmark = pytest.mark.skipif(not os.getenv("GEMINI_API_KEY"), reason="GEMINI_API_KEY is not set")
 
-def test_basic_functionality():
+
+async def test_basic_functionality():
     """Test the basic functionality of the multi-agent system."""
     
     print("🧪 Testing Multi-Agent Product Requirements Refinement System")
@@ -31,53 +34,40 @@ def test_basic_functionality():
     
     # Prepare the initial state
     initial_state: OverallState = {
+        **BASE_STATE,
         "messages": [HumanMessage(content=test_query)],
-        "user_query": test_query,
-        "query_type": QueryType.GENERAL,
-        "debate_category": None,
-        "domain_expert_analysis": None,
-        "ux_ui_specialist_analysis": None,
-        "technical_architect_analysis": None,
-        "moderator_aggregation": None,
-        "debate_resolution": None,
-        "final_answer": None,
-        "processing_time": 0.0
+        "user_query": test_query
     }
     
-    try:
-        print("🔄 Running multi-agent analysis...")
-        
-        # Run the graph
-        result = graph.invoke(initial_state)
-        
-        print("✅ Analysis completed successfully!")
-        print()
-        
-        # Check if we got the expected outputs
-        print("📊 Results Summary:")
-        print(f"  - Query Type: {result.get('query_type', 'Unknown')}")
-        print(f"  - Domain Analysis: {'✅' if result.get('domain_expert_analysis') else '❌'}")
-        print(f"  - UX/UI Analysis: {'✅' if result.get('ux_ui_specialist_analysis') else '❌'}")
-        print(f"  - Technical Analysis: {'✅' if result.get('technical_architect_analysis') else '❌'}")
-        print(f"  - Moderator Aggregation: {'✅' if result.get('moderator_aggregation') else '❌'}")
-        print(f"  - Final Answer: {'✅' if result.get('final_answer') else '❌'}")
-        
-        # Display final answer
-        if result.get("final_answer"):
-            print("\n📝 Final Answer Preview:")
-            print("-" * 30)
-            answer = result["final_answer"]
-            preview = answer[:200] + "..." if len(answer) > 200 else answer
-            print(preview)
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error during testing: {str(e)}")
-        return False
+    print("🔄 Running multi-agent analysis...")
+    
+    # Run the graph
+    result = await cached_ainvoke(graph, initial_state, {"configurable": {"thread_id": tid("system_basic")}})
+    
+    print("✅ Analysis completed successfully!")
+    print()
+    
+    # Check if we got the expected outputs
+    print("📊 Results Summary:")
+    print(f"  - Query Type: {result.get('query_type', 'Unknown')}")
+    print(f"  - Domain Analysis: {'✅' if result.get('domain_expert_analysis') else '❌'}")
+    print(f"  - UX/UI Analysis: {'✅' if result.get('ux_ui_specialist_analysis') else '❌'}")
+    print(f"  - Technical Analysis: {'✅' if result.get('technical_architect_analysis') else '❌'}")
+    print(f"  - Moderator Aggregation: {'✅' if result.get('moderator_aggregation') else '❌'}")
+    print(f"  - Final Answer: {'✅' if result.get('final_answer') else '❌'}")
+    
+    # Display final answer
+    if result.get("final_answer"):
+        print("\n📝 Final Answer Preview:")
+        print("-" * 30)
+        answer = result["final_answer"]
+        preview = answer[:200] + "..." if len(answer) > 200 else answer
+        print(preview)
+    
+    assert result.get("final_answer"), "The graph produced no final answer"
 
 
-def test_debate_handling():
+async def test_debate_handling():
     """Test the debate handling functionality."""
     
     print("\n🧪 Testing Debate Handling")
@@ -91,38 +81,35 @@ def test_debate_handling():
     
     # Prepare the initial state
     initial_state: OverallState = {
+        **BASE_STATE,
         "messages": [HumanMessage(content=test_debate)],
-        "user_query": test_debate,
-        "query_type": QueryType.GENERAL,
-        "debate_category": None,
-        "domain_expert_analysis": None,
-        "ux_ui_specialist_analysis": None,
-        "technical_architect_analysis": None,
-        "moderator_aggregation": None,
-        "debate_resolution": None,
-        "final_answer": None,
-        "processing_time": 0.0
+        "user_query": test_debate
     }
     
+    print("🔄 Running debate analysis...")
+    
+    # Run the graph
+    result = await cached_ainvoke(graph, initial_state, {"configurable": {"thread_id": tid("system_debate")}})
+    
+    print("✅ Debate analysis completed successfully!")
+    print()
+    
+    # Check debate-specific outputs
+    print("📊 Debate Results Summary:")
+    print(f"  - Debate Category: {result.get('debate_category', 'None')}")
+    print(f"  - Debate Resolution: {'✅' if result.get('debate_resolution') else '❌'}")
+    print(f"  - Final Answer: {'✅' if result.get('final_answer') else '❌'}")
+    
+    assert result.get("final_answer"), "The graph produced no final answer for the debate"
+
+
+def _passed(test_func) -> bool:
+    """Run an async test function and report whether it passed."""
     try:
-        print("🔄 Running debate analysis...")
-        
-        # Run the graph
-        result = graph.invoke(initial_state)
-        
-        print("✅ Debate analysis completed successfully!")
-        print()
-        
-        # Check debate-specific outputs
-        print("📊 Debate Results Summary:")
-        print(f"  - Debate Category: {result.get('debate_category', 'None')}")
-        print(f"  - Debate Resolution: {'✅' if result.get('debate_resolution') else '❌'}")
-        print(f"  - Final Answer: {'✅' if result.get('final_answer') else '❌'}")
-        
+        asyncio.run(test_func())
         return True
-        
     except Exception as e:
-        print(f"❌ Error during debate testing: {str(e)}")
+        print(f"❌ Error during testing: {str(e)}")
         return False
 
 
@@ -139,10 +126,10 @@ def main():
     print("=" * 60)
     
     # Run basic functionality test
-    basic_test_passed = test_basic_functionality()
+    basic_test_passed = _passed(test_basic_functionality)
     
     # Run debate handling test
-    debate_test_passed = test_debate_handling()
+    debate_test_passed = _passed(test_debate_handling)
     
     print("\n" + "=" * 60)
     print("📋 Test Results Summary:")
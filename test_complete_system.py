@@ -3,189 +3,353 @@
 Complete system test script to verify context management is working.
 """
 
-import requests
-import json
+import asyncio
+import functools
+import hashlib
+import httpx
+import orjson
 import time
-import uuid
+from secrets import token_hex
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+try:
+    import ijson
+except ImportError:  # Fall back to decoding the whole body
+    ijson = None
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
 
 # Configuration
 API_BASE_URL = "http://localhost:2024"
+REQUEST_TIMEOUT = 10
+# Refinement runs the full multi-agent graph, so allow it much longer
+REFINE_TIMEOUT = 300
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-def test_complete_system():
+async def test_complete_system():
     """Test the complete system with context management."""
+    # One pooled client for every request, so the connection to the
+    # backend stays alive between tests. With h2 installed, concurrent
+    # requests to an HTTP/2 (TLS) backend share one multiplexed connection;
+    # otherwise they use HTTP/1.1 keep-alive.
+    async with httpx.AsyncClient(
+        http2=HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+        timeout=REQUEST_TIMEOUT
+    ) as client:
+        await _run_tests(client)
+
+
+@functools.lru_cache(maxsize=None)
+def endpoint_urls(thread_id: str) -> dict[str, httpx.URL]:
+    """Build every endpoint URL the tests use, once per thread."""
+    return {
+        "health": httpx.URL(f"{API_BASE_URL}/api/health"),
+        "ctx": httpx.URL(f"{API_BASE_URL}/api/context/{thread_id}"),
+        "refine": httpx.URL(f"{API_BASE_URL}/api/refine-requirements"),
+        "hist": httpx.URL(f"{API_BASE_URL}/api/conversation-history/{thread_id}"),
+        "hist_default": httpx.URL(f"{API_BASE_URL}/api/conversation-history/default"),
+        "ctx_check": httpx.URL(f"{API_BASE_URL}/api/context/check"),
+    }
+
+
+class ProbeResult(NamedTuple):
+    """Outcome of one timed request."""
+    ok: bool
+    status: Optional[int]
+    body: Any
+    elapsed: float
+    error: Optional[Exception] = None
+
+
+async def _read_json(response: httpx.Response) -> Any:
+    """Read and decode a whole JSON body."""
+    return orjson.loads(await response.aread())
+
+
+async def probe(client: httpx.AsyncClient, method: str, url: httpx.URL, *,
+                content: Optional[bytes] = None, expect: int = 200,
+                read: Callable[[httpx.Response], Awaitable[Any]] = _read_json,
+                shape: Optional[type] = dict,
+                timeout: float = REQUEST_TIMEOUT) -> ProbeResult:
+    """
+    Send one request and time it with perf_counter.
+    
+    A request body is sent as pre-serialized JSON bytes. The response body
+    is read with `read` only when the status is the expected one, and must
+    then be an instance of `shape` (any shape when None). Request, decode
+    and shape errors are returned in the result instead of raised, so
+    gathered probes can be reported one by one.
+    """
+    headers = JSON_HEADERS if content is not None else None
+    start = time.perf_counter()
+    try:
+        async with client.stream(method, url, content=content, headers=headers, timeout=timeout) as response:
+            ok = response.status_code == expect
+            body = await read(response) if ok else None
+            if ok and shape is not None and not isinstance(body, shape):
+                raise TypeError(f"expected a JSON {shape.__name__}, got {type(body).__name__}")
+    except Exception as e:
+        return ProbeResult(False, None, None, time.perf_counter() - start, e)
+    return ProbeResult(ok, response.status_code, body, time.perf_counter() - start)
+
+
+def _report_failure(label: str, result: ProbeResult):
+    """Print why a probe did not succeed."""
+    if result.error is not None:
+        print(f"❌ {label} error: {result.error}")
+    else:
+        print(f"❌ {label} failed: {result.status}")
+
+
+# (thread_id, endpoint) -> (body digest, decoded JSON) of the last context read
+_CTX_CACHE: dict[tuple[str, str], tuple[bytes, dict]] = {}
+
+
+async def _read_context(thread_id: str, response: httpx.Response) -> dict:
+    """
+    Decode a context body, reusing the last decoded dict for the thread.
+    
+    When the body is byte-for-byte the one seen last for this thread, the
+    previously decoded dict is returned instead of decoding it again.
+    """
+    content = await response.aread()
+    key = (thread_id, "ctx")
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    cached = _CTX_CACHE.get(key)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+    data = orjson.loads(content)
+    _CTX_CACHE[key] = (digest, data)
+    return data
+
+
+async def _read_history_entries(response: httpx.Response) -> Any:
+    """
+    Decode a conversation history body into its list of entries.
+    
+    The {thread_id} history route also matches "default" and wraps its
+    entries as {"history": [...]}, so both that and a bare list are accepted.
+    """
+    body = await _read_json(response)
+    if isinstance(body, dict):
+        return body.get("history", [])
+    return body
+
+
+async def get_context(client: httpx.AsyncClient, thread_id: str) -> ProbeResult:
+    """Fetch a thread's context."""
+    return await probe(client, "GET", endpoint_urls(thread_id)["ctx"],
+                       read=functools.partial(_read_context, thread_id))
+
+
+# Scalar fields of a refine-requirements response that the tests report
+_REFINE_FIELDS = ("processing_time", "query_type", "is_followup")
+
+
+async def _read_refine_summary(response: httpx.Response) -> dict:
+    """
+    Reduce a refine-requirements body to the reported fields and answer_length.
+    
+    With ijson installed the body is parsed as it streams in, so the answer
+    and the per-agent analyses are measured or skipped one value at a time
+    instead of being decoded into one dict.
+    """
+    if ijson is None:
+        result = await _read_json(response)
+        summary = {field: result.get(field) for field in _REFINE_FIELDS if field in result}
+        summary["answer_length"] = len(result.get("answer") or "")
+        return summary
+    
+    summary = {"answer_length": 0}
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    async for chunk in response.aiter_bytes():
+        parser.send(chunk)
+        for prefix, event, value in events:
+            if prefix == "answer" and event == "string":
+                summary["answer_length"] = len(value)
+            elif prefix in _REFINE_FIELDS and event in ("string", "number", "boolean"):
+                summary[prefix] = value
+        del events[:]
+    parser.close()
+    return summary
+
+
+async def post_refine(client: httpx.AsyncClient, thread_id: str, body: bytes) -> ProbeResult:
+    """POST a pre-serialized refinement query; the result body is its summary."""
+    return await probe(client, "POST", endpoint_urls(thread_id)["refine"],
+                       content=body, read=_read_refine_summary, timeout=REFINE_TIMEOUT)
+
+
+async def wait_for_count(client: httpx.AsyncClient, thread_id: str, expected: int,
+                         timeout: float = 10.0, interval: float = 0.1) -> bool:
+    """
+    Poll a thread's context until its conversation count reaches expected.
     
+    The poll interval backs off by 1.5x up to 0.5s. Returns False if the
+    count is not reached within timeout seconds.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        result = await get_context(client, thread_id)
+        if result.ok and result.body.get('conversation_count', 0) >= expected:
+            return True
+        if loop.time() + interval > deadline:
+            return False
+        await asyncio.sleep(interval)
+        interval = min(interval * 1.5, 0.5)
+
+
+async def _run_tests(client: httpx.AsyncClient):
+    """Run the numbered tests over a shared client."""
     print("🚀 Testing Complete System with Context Management")
     print("=" * 60)
     
     # Generate a unique thread ID for testing
-    thread_id = f"hackathon_test_{uuid.uuid4().hex[:8]}"
+    thread_id = f"hackathon_test_{token_hex(4)}"
     print(f"📝 Using test thread ID: {thread_id}")
+    urls = endpoint_urls(thread_id)
+    
+    # Serialize the request bodies once, up front
+    first_query = "Build a social media app for connecting professionals"
+    followup_query = "What about the revenue model for this app?"
+    first_body = orjson.dumps({"query": first_query, "query_type": "general", "thread_id": thread_id})
+    followup_body = orjson.dumps({"query": followup_query, "query_type": "revenue", "thread_id": thread_id})
+    check_body = orjson.dumps({"thread_id": thread_id, "query": "test"})
+    
+    # Tests 1 and 2 are independent, so send both requests at once
+    health, initial_context = await asyncio.gather(
+        probe(client, "GET", urls["health"]),
+        get_context(client, thread_id)
+    )
     
     # Test 1: Health check
     print("\n1️⃣ Testing system health...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/health")
-        if response.status_code == 200:
-            health_data = response.json()
-            print(f"✅ System healthy: {health_data.get('status')}")
-            print(f"   Version: {health_data.get('version')}")
-            print(f"   Architecture: {health_data.get('architecture')}")
-        else:
-            print(f"❌ Health check failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Health check error: {e}")
+    if health.ok:
+        health_data = health.body
+        print(f"✅ System healthy: {health_data.get('status')}")
+        print(f"   Version: {health_data.get('version')}")
+        print(f"   Architecture: {health_data.get('architecture')}")
+    else:
+        _report_failure("Health check", health)
     
     # Test 2: Initial context check
     print("\n2️⃣ Testing initial context...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/context/{thread_id}")
-        if response.status_code == 200:
-            context_data = response.json()
-            print(f"✅ Context check successful")
-            print(f"   Has context: {context_data.get('has_context', False)}")
-            print(f"   Conversation count: {context_data.get('conversation_count', 0)}")
-        else:
-            print(f"❌ Context check failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Context check error: {e}")
+    if initial_context.ok:
+        context_data = initial_context.body
+        print(f"✅ Context check successful")
+        print(f"   Has context: {context_data.get('has_context', False)}")
+        print(f"   Conversation count: {context_data.get('conversation_count', 0)}")
+    else:
+        _report_failure("Context check", initial_context)
     
     # Test 3: First query
     print("\n3️⃣ Testing first query...")
-    first_query = "Build a social media app for connecting professionals"
-    try:
-        response = requests.post(
-            f"{API_BASE_URL}/api/refine-requirements",
-            json={
-                "query": first_query,
-                "query_type": "general",
-                "thread_id": thread_id
-            }
-        )
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ First query successful")
-            print(f"   Processing time: {result.get('processing_time', 0):.2f}s")
-            print(f"   Answer length: {len(result.get('answer', ''))} chars")
-            print(f"   Query type: {result.get('query_type', 'N/A')}")
-            print(f"   Is follow-up: {result.get('is_followup', False)}")
-        else:
-            print(f"❌ First query failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ First query error: {e}")
+    first = await post_refine(client, thread_id, first_body)
+    if first.ok:
+        result = first.body
+        print(f"✅ First query successful")
+        print(f"   Processing time: {result.get('processing_time', 0):.2f}s")
+        print(f"   Answer length: {result['answer_length']} chars")
+        print(f"   Query type: {result.get('query_type', 'N/A')}")
+        print(f"   Is follow-up: {result.get('is_followup', False)}")
+    else:
+        _report_failure("First query", first)
     
-    # Wait for processing
-    time.sleep(3)
+    # Wait until the query is recorded in the thread's context
+    if not await wait_for_count(client, thread_id, 1):
+        print("⚠️ Conversation count did not reach 1 in time")
     
     # Test 4: Context after first query
     print("\n4️⃣ Testing context after first query...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/context/{thread_id}")
-        if response.status_code == 200:
-            context_data = response.json()
-            print(f"✅ Context check successful")
-            print(f"   Has context: {context_data.get('has_context', False)}")
-            print(f"   Conversation count: {context_data.get('conversation_count', 0)}")
-            if context_data.get('history'):
-                print(f"   Latest query: {context_data['history'][0].get('user_query', 'N/A')[:50]}...")
-        else:
-            print(f"❌ Context check failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Context check error: {e}")
+    context = await get_context(client, thread_id)
+    if context.ok:
+        context_data = context.body
+        print(f"✅ Context check successful")
+        print(f"   Has context: {context_data.get('has_context', False)}")
+        print(f"   Conversation count: {context_data.get('conversation_count', 0)}")
+        if context_data.get('history'):
+            print(f"   Latest query: {context_data['history'][0].get('user_query', 'N/A')[:50]}...")
+    else:
+        _report_failure("Context check", context)
     
     # Test 5: Follow-up query
     print("\n5️⃣ Testing follow-up query...")
-    followup_query = "What about the revenue model for this app?"
-    try:
-        response = requests.post(
-            f"{API_BASE_URL}/api/refine-requirements",
-            json={
-                "query": followup_query,
-                "query_type": "revenue",
-                "thread_id": thread_id
-            }
-        )
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ Follow-up query successful")
-            print(f"   Processing time: {result.get('processing_time', 0):.2f}s")
-            print(f"   Answer length: {len(result.get('answer', ''))} chars")
-            print(f"   Is follow-up: {result.get('is_followup', False)}")
-            print(f"   Query type: {result.get('query_type', 'N/A')}")
-        else:
-            print(f"❌ Follow-up query failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Follow-up query error: {e}")
+    followup = await post_refine(client, thread_id, followup_body)
+    if followup.ok:
+        result = followup.body
+        print(f"✅ Follow-up query successful")
+        print(f"   Processing time: {result.get('processing_time', 0):.2f}s")
+        print(f"   Answer length: {result['answer_length']} chars")
+        print(f"   Is follow-up: {result.get('is_followup', False)}")
+        print(f"   Query type: {result.get('query_type', 'N/A')}")
+    else:
+        _report_failure("Follow-up query", followup)
     
-    # Wait for processing
-    time.sleep(3)
+    # Wait until the query is recorded in the thread's context
+    if not await wait_for_count(client, thread_id, 2):
+        print("⚠️ Conversation count did not reach 2 in time")
     
     # Test 6: Final context check
     print("\n6️⃣ Testing final context...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/context/{thread_id}")
-        if response.status_code == 200:
-            context_data = response.json()
-            print(f"✅ Final context check successful")
-            print(f"   Has context: {context_data.get('has_context', False)}")
-            print(f"   Conversation count: {context_data.get('conversation_count', 0)}")
-            if context_data.get('history'):
-                print(f"   Total conversations: {len(context_data['history'])}")
-                for i, conv in enumerate(context_data['history'][:3]):
-                    print(f"   Conversation {i+1}: {conv.get('user_query', 'N/A')[:40]}...")
-        else:
-            print(f"❌ Final context check failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Final context check error: {e}")
+    final_context = await get_context(client, thread_id)
+    if final_context.ok:
+        context_data = final_context.body
+        print(f"✅ Final context check successful")
+        print(f"   Has context: {context_data.get('has_context', False)}")
+        print(f"   Conversation count: {context_data.get('conversation_count', 0)}")
+        if context_data.get('history'):
+            print(f"   Total conversations: {len(context_data['history'])}")
+            for i, conv in enumerate(context_data['history'][:3]):
+                print(f"   Conversation {i+1}: {conv.get('user_query', 'N/A')[:40]}...")
+    else:
+        _report_failure("Final context check", final_context)
+    
+    # Tests 7, 8 and 9 only read what is already stored, so send all
+    # three requests at once
+    history, default_history, check = await asyncio.gather(
+        probe(client, "GET", urls["hist"]),
+        probe(client, "GET", urls["hist_default"], read=_read_history_entries, shape=list),
+        probe(client, "POST", urls["ctx_check"], content=check_body)
+    )
     
     # Test 7: Conversation history
     print("\n7️⃣ Testing conversation history...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/conversation-history/{thread_id}")
-        if response.status_code == 200:
-            history_data = response.json()
-            print(f"✅ Conversation history successful")
-            print(f"   History entries: {len(history_data.get('history', []))}")
-            if history_data.get('thread_summary'):
-                print(f"   Thread summary: {history_data['thread_summary'].get('conversation_count', 0)} conversations")
-        else:
-            print(f"❌ Conversation history failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Conversation history error: {e}")
+    if history.ok:
+        history_data = history.body
+        print(f"✅ Conversation history successful")
+        print(f"   History entries: {len(history_data.get('history', []))}")
+        if history_data.get('thread_summary'):
+            print(f"   Thread summary: {history_data['thread_summary'].get('conversation_count', 0)} conversations")
+    else:
+        _report_failure("Conversation history", history)
     
     # Test 8: Default history
     print("\n8️⃣ Testing default history...")
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/conversation-history/default")
-        if response.status_code == 200:
-            default_history = response.json()
-            print(f"✅ Default history successful")
-            print(f"   Total entries: {len(default_history)}")
-            if default_history:
-                print(f"   Latest entry: {default_history[0].get('user_query', 'N/A')[:40]}...")
-        else:
-            print(f"❌ Default history failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Default history error: {e}")
+    if default_history.ok:
+        default_entries = default_history.body
+        print(f"✅ Default history successful")
+        print(f"   Total entries: {len(default_entries)}")
+        if default_entries:
+            print(f"   Latest entry: {default_entries[0].get('user_query', 'N/A')[:40]}...")
+    else:
+        _report_failure("Default history", default_history)
     
     # Test 9: Context check API
     print("\n9️⃣ Testing context check API...")
-    try:
-        response = requests.post(
-            f"{API_BASE_URL}/api/context/check",
-            json={
-                "thread_id": thread_id,
-                "query": "test"
-            }
-        )
-        if response.status_code == 200:
-            check_data = response.json()
-            print(f"✅ Context check API successful")
-            print(f"   Has context: {check_data.get('has_context', False)}")
-            print(f"   Conversation count: {check_data.get('conversation_count', 0)}")
-        else:
-            print(f"❌ Context check API failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Context check API error: {e}")
+    if check.ok:
+        check_data = check.body
+        print(f"✅ Context check API successful")
+        print(f"   Has context: {check_data.get('has_context', False)}")
+        print(f"   Conversation count: {check_data.get('conversation_count', 0)}")
+    else:
+        _report_failure("Context check API", check)
     
     print("\n" + "=" * 60)
     print("🎉 Complete System Test Results:")
@@ -198,4 +362,4 @@ def test_complete_system():
     print("\n🚀 System is ready for hackathon demo!")
 
 if __name__ == "__main__":
-    test_complete_system()
+    asyncio.run(test_complete_system())